@@ -0,0 +1,67 @@
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pygame
+
+from flower_pygame import flower_game as fg
+
+COUNTS = (1000, 10000)
+FRAMES = 30
+
+# ---------------- Draw variants ----------------
+def flower_rows(field):
+    n = field.n
+    return zip(field.x[:n].tolist(), field.y[:n].tolist(), field.size[:n].tolist(), field.color[:n].tolist())
+
+def draw_circles(surf, field):
+    # what Flower.draw used to do: five circle draws per flower
+    for x, y, size, color in flower_rows(field):
+        r = size // 2
+        cx, cy = int(x), int(y)
+        petal_r = int(r * 0.9)
+        for ox, oy in ((r, 0), (-r, 0), (0, r), (0, -r)):
+            pygame.draw.circle(surf, fg.FLOWER_COLORS[color], (cx + ox, cy + oy), petal_r)
+        pygame.draw.circle(surf, fg.WHITE, (cx, cy), r)
+
+def draw_blit(surf, field):
+    for x, y, size, color in flower_rows(field):
+        sprite, (ax, ay) = fg.FLOWER_SPRITES.get(size, fg.FLOWER_COLORS[color])
+        surf.blit(sprite, (int(x) - ax, int(y) - ay))
+
+def draw_blits(surf, field):
+    field.draw(surf)
+
+VARIANTS = [("circles", draw_circles), ("blit", draw_blit), ("blits", draw_blits)]
+
+def bench(surf, field, fn):
+    fn(surf, field)  # warmup
+    t0 = time.perf_counter()
+    for _ in range(FRAMES):
+        surf.fill(fg.BG)
+        fn(surf, field)
+    return (time.perf_counter() - t0) / FRAMES * 1000.0
+
+def main():
+    pygame.display.init()
+    screen = pygame.display.set_mode((fg.WIDTH, fg.HEIGHT))
+    fg.FLOWER_SPRITES.warm(fg.flower_variants())
+    for n in COUNTS:
+        field = fg.FlowerField(capacity=n, seed=n)
+        field.spawn(n)
+        field.y[:n] = field.y[:n] % fg.HEIGHT + field.size[:n]
+        base = None
+        for name, fn in VARIANTS:
+            ms = bench(screen, field, fn)
+            base = base or ms
+            print(f"{n:>6} flowers  {name:<8} {ms:8.2f} ms/frame  x{base / ms:5.1f}")
+
+if __name__ == "__main__":
+    main()
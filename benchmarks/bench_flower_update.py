@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pygame
+
+from flower_pygame import flower_game as fg
+
+COUNTS = (1000, 10000, 50000)
+STEPS = 20
+DT = 1 / 60
+
+# ---------------- Object-per-flower baseline ----------------
+# The update loop as it was before FlowerField: one object per flower, two
+# Rect allocations per flower and list.remove for every catch or miss.
+class LegacyFlower:
+    __slots__ = ("x", "y", "speed", "wind", "size")
+
+    def update(self, dt):
+        self.y += self.speed * (dt * 60)
+        self.x += self.wind * (dt * 60) * 0.3
+        if self.x < self.size:
+            self.x, self.wind = self.size, abs(self.wind)
+        elif self.x > fg.WIDTH - self.size:
+            self.x, self.wind = fg.WIDTH - self.size, -abs(self.wind)
+
+    def rect(self):
+        r = self.size
+        return pygame.Rect(int(self.x - r), int(self.y - r), r * 2, r * 2)
+
+def legacy_flowers(field):
+    flowers = []
+    n = field.n
+    for x, y, speed, wind, size in zip(field.x[:n].tolist(), field.y[:n].tolist(), field.speed[:n].tolist(),
+                                       field.wind[:n].tolist(), field.size[:n].tolist()):
+        f = LegacyFlower()
+        f.x, f.y, f.speed, f.wind, f.size = x, y, speed, wind, size
+        flowers.append(f)
+    return flowers
+
+def legacy_update(flowers, basket, dt):
+    for f in list(flowers):
+        f.update(dt)
+        if f.rect().colliderect(basket.rect):
+            flowers.remove(f)
+        elif f.y - f.size > fg.HEIGHT + 40:
+            flowers.remove(f)
+
+# ---------------- Runner ----------------
+def make_field(n):
+    field = fg.FlowerField(capacity=n, seed=n)
+    field.spawn(n)
+    # spread over the whole screen so catches and misses happen every step
+    field.y[:n] = field.rng.uniform(0, fg.HEIGHT + 60, n)
+    return field
+
+def main():
+    basket = fg.Basket()
+    b = (int(basket.x), int(basket.y), basket.w, basket.h)
+    for n in COUNTS:
+        field = make_field(n)
+        flowers = legacy_flowers(field)
+        t0 = time.perf_counter()
+        for _ in range(STEPS):
+            legacy_update(flowers, basket, DT)
+        legacy_ms = (time.perf_counter() - t0) / STEPS * 1000.0
+
+        t0 = time.perf_counter()
+        for _ in range(STEPS):
+            field.update(DT, b)
+        field_ms = (time.perf_counter() - t0) / STEPS * 1000.0
+        print(f"{n:>6} flowers  objects {legacy_ms:9.3f} ms/step  field {field_ms:7.3f} ms/step  x{legacy_ms / field_ms:6.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from snaketail_pygame import snake_game as sg
+
+BOARDS = ((32, 24), (64, 48), (128, 96))
+
+def run(grid, budget_ms, max_ticks, seed):
+    random.seed(seed)
+    game = sg.SnakeGame(None, grid=grid, autopilot=True, budget_ms=budget_ms)
+    game.state = "PLAY"
+    game.reset()
+    t0 = time.perf_counter()
+    ticks = 0
+    while game.state == "PLAY" and ticks < max_ticks:
+        game.logic()
+        ticks += 1
+    elapsed = time.perf_counter() - t0
+    return game, ticks, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Snake autopilot benchmark")
+    parser.add_argument("--budget", type=float, default=sg.AUTOPILOT_BUDGET_MS, metavar="MS")
+    parser.add_argument("--ticks", type=int, default=400000, help="tick limit per board")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    for grid in BOARDS:
+        game, ticks, elapsed = run(grid, args.budget, args.ticks, args.seed)
+        st = game.autopilot.stats()
+        cells = grid[0] * grid[1]
+        print(f"{grid[0]:>4}x{grid[1]:<4} {game.state:<9} score {game.score:>6}  fill {len(game.snake) / cells:6.1%}"
+              f"  ticks {ticks:>7}  plan avg {st['avg_ms']:.3f} p99 {st['p99_ms']:.3f} max {st['max_ms']:.3f} ms"
+              f"  routed {st['routed'] / max(1, ticks):.0%}  over budget {st['overruns']}  ({elapsed:.1f}s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from snaketail_pygame import snake_game as sg
+
+# (snake length, grid w, grid h)
+CASES = ((10, 32, 24), (1000, 64, 64), (100000, 512, 512))
+TICKS = 2000
+
+# ---------------- Track ----------------
+# The snake chases its own tail around a Hamiltonian cycle of the board, so
+# it never dies and never eats, and every tick is a plain move.
+def cycle(w, h):
+    # column 0 is the way back up; rows snake through columns 1..w-1
+    order = []
+    for y in range(h):
+        xs = range(1, w) if y % 2 == 0 else range(w - 1, 0, -1)
+        order += [(x, y) for x in xs]
+    order += [(0, y) for y in range(h - 1, -1, -1)]
+    return order
+
+def track(w, h, length):
+    order = cycle(w, h)
+    turns = {}
+    for i, (x, y) in enumerate(order):
+        nx, ny = order[(i + 1) % len(order)]
+        turns[y * w + x] = (nx - x, ny - y)
+    body = [y * w + x for x, y in reversed(order[:length])]  # head first
+    return body, turns
+
+# ---------------- List-of-tuples baseline ----------------
+# SnakeGame.logic as it was: list.insert(0) plus a linear `in` scan.
+def legacy_ticks(body, turns, w, h, ticks):
+    snake = [(c % w, c // w) for c in body]
+    food = None
+    for _ in range(ticks):
+        x, y = snake[0]
+        d = turns[y * w + x]
+        new_head = ((x + d[0]) % w, (y + d[1]) % h)
+        if new_head in snake[:-1]:
+            raise RuntimeError("legacy snake collided")
+        snake.insert(0, new_head)
+        if new_head != food:
+            snake.pop()
+
+def make_game(body, w, h):
+    game = sg.SnakeGame(None, grid=(w, h))
+    game.state = "PLAY"
+    game.set_body(body)
+    game.food = -1
+    return game
+
+def game_ticks(game, turns, ticks):
+    for _ in range(ticks):
+        game.next_dir = turns[game.snake[0]]
+        game.logic()
+    if game.state != "PLAY":
+        raise RuntimeError("snake collided")
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - t0) / TICKS * 1e6
+
+def main():
+    for length, w, h in CASES:
+        body, turns = track(w, h, length)
+        legacy_us = timed(legacy_ticks, body, turns, w, h, TICKS)
+        game_us = timed(game_ticks, make_game(body, w, h), turns, TICKS)
+        print(f"len {length:>6} on {w}x{h:<4}  list {legacy_us:10.2f} us/tick  deque+grid {game_us:7.2f} us/tick")
+
+if __name__ == "__main__":
+    main()
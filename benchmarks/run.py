@@ -0,0 +1,223 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pygame
+
+from benchmarks.bench_snake_logic import track
+from dino_pygame import dino
+from flower_pygame import flower_game as fg
+from snaketail_pygame import snake_game as sg
+
+# Headless suite over the update and draw hot paths of all three games.
+# A scenario builds a game in a fixed, busy state and hands back phases as
+# (prep, fn): prep runs untimed before every timed fn call (refills, keeps
+# the player alive, makes the update a draw needs), so each phase times
+# exactly one thing. Per phase: WARMUP untimed calls, then REPS samples of
+# INNER calls; the summary is over the per-call mean of each sample.
+
+WARMUP = 5
+REPS = 15
+INNER = 20
+REGRESSION = 0.10  # --compare flags phases this much slower (by median)
+
+# ---------------- Flower ----------------
+def flower_storm(screen, n):
+    game = fg.Game(screen, storm=True)
+    game.state = "PLAY"
+    game.reset()
+    field = game.field
+
+    def refill():
+        # back to n flowers, the new ones spread over the screen
+        missing = n - field.n
+        if missing > 0:
+            field.spawn(missing)
+            field.y[field.n - missing:field.n] %= fg.HEIGHT
+        game.time_left = game.lives = 999
+
+    def step():
+        refill()
+        game.update(1.0 / fg.FPS)
+
+    refill()
+    return {
+        "update": (refill, lambda: game.update(1.0 / fg.FPS)),
+        "draw": (step, lambda: game.draw_game(0.5)),
+    }
+
+# ---------------- Snake ----------------
+def snake_fill(screen, grid, fill):
+    # the snake chases its tail around a Hamiltonian cycle, so it never
+    # dies and every tick moves the whole body's worth of shading
+    w, h = grid
+    body, turns = track(w, h, int(w * h * fill))
+    game = sg.SnakeGame(screen, grid=grid)
+    game.state = "PLAY"
+    game.set_body(body)
+    game.food = -1
+    game.full_redraw = True
+
+    def tick():
+        game.next_dir = turns[game.snake[0]]
+        game.logic()
+
+    return {
+        "update": (lambda: None, tick),
+        "draw": (tick, game.draw),
+    }
+
+# ---------------- Dino ----------------
+DINO_GAP = (110, 190)  # px between obstacles, well under the game's own gaps
+
+def dino_max_speed(screen):
+    game = dino.Game(screen, seed=1)
+    game.state = "PLAY"
+    game.reset()
+    game.distance_px = 100000.0  # far past the speed cap
+    game.spawns = dino.SpawnSchedule(1, {k: game.distance_px for k in dino.STREAMS})
+    rng = random.Random(1)
+    dt = dino.STEP_MS / 1000.0
+
+    def dense():
+        # keep the course packed from the T-Rex to past the right edge and
+        # never let a hit end the run
+        game.state = "PLAY"
+        last = max((o.x for o in game.obstacles), default=0.0)
+        while last < dino.WIDTH + 200:
+            last += rng.randint(*DINO_GAP)
+            if rng.random() < 0.3:
+                game.obstacles.add(dino.Pterodactyl(last, rng.randint(dino.PTERO_MIN_ALT, dino.PTERO_MAX_ALT)))
+            else:
+                game.obstacles.add(dino.Cactus(last, rng.choice(dino.CACTUS_WIDTHS), rng.choice(dino.CACTUS_HEIGHTS)))
+
+    def step():
+        dense()
+        game.update(dt, dino.JUMP if rng.random() < 0.05 else 0)
+
+    dense()
+    return {
+        "update": (dense, lambda: game.update(dt, dino.JUMP if rng.random() < 0.05 else 0)),
+        "draw": (step, lambda: game.draw_game(0.5)),
+    }
+
+SCENARIOS = {
+    "flower_storm_1k": (lambda s: flower_storm(s, 1000), (fg.WIDTH, fg.HEIGHT)),
+    "flower_storm_10k": (lambda s: flower_storm(s, 10000), (fg.WIDTH, fg.HEIGHT)),
+    "flower_storm_50k": (lambda s: flower_storm(s, 50000), (fg.WIDTH, fg.HEIGHT)),
+    "snake_fill_32x24": (lambda s: snake_fill(s, (32, 24), 0.95), (sg.WIDTH, sg.HEIGHT)),
+    "snake_fill_512x512": (lambda s: snake_fill(s, (512, 512), 0.9), (sg.WIDTH, sg.HEIGHT)),
+    "dino_max_speed": (dino_max_speed, (dino.WIDTH, dino.HEIGHT)),
+}
+
+# ---------------- Harness ----------------
+def measure(prep, fn, warmup, reps, inner):
+    for _ in range(warmup):
+        prep()
+        fn()
+    samples = []
+    clock = time.perf_counter
+    for _ in range(reps):
+        spent = 0.0
+        for _ in range(inner):
+            prep()
+            t0 = clock()
+            fn()
+            spent += clock() - t0
+        samples.append(spent / inner * 1000.0)
+    return summarize(samples)
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        "median_ms": statistics.median(ordered),
+        "mean_ms": statistics.fmean(ordered),
+        "stdev_ms": statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        "min_ms": ordered[0],
+        "p95_ms": ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+        "samples_ms": samples,
+    }
+
+def commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+        return out.stdout.strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+def compare(results, baseline_path):
+    # median ratios against an earlier run; returns how many got slower
+    base = json.loads(Path(baseline_path).read_text())["results"]
+    slower = 0
+    print(f"\nagainst {baseline_path}:")
+    for name, phases in results.items():
+        for phase, r in phases.items():
+            old = base.get(name, {}).get(phase)
+            if old is None:
+                continue
+            ratio = r["median_ms"] / old["median_ms"]
+            flag = ""
+            if ratio > 1 + REGRESSION:
+                flag = "  SLOWER"
+                slower += 1
+            elif ratio < 1 - REGRESSION:
+                flag = "  faster"
+            print(f"  {name:<20} {phase:<6} {old['median_ms']:9.4f} -> {r['median_ms']:9.4f} ms  x{ratio:5.2f}{flag}")
+    return slower
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless update/draw benchmarks for all three games")
+    parser.add_argument("scenarios", nargs="*", help=f"substrings to pick scenarios by ({', '.join(SCENARIOS)})")
+    parser.add_argument("--warmup", type=int, default=WARMUP)
+    parser.add_argument("--reps", type=int, default=REPS)
+    parser.add_argument("--inner", type=int, default=INNER, help="timed calls per sample")
+    parser.add_argument("--out", help="results JSON (default: bench-<commit>.json)")
+    parser.add_argument("--compare", metavar="JSON", help="earlier results to compare against")
+    args = parser.parse_args()
+
+    pygame.init()
+    rev = commit()
+    results = {}
+    print(f"{'scenario':<20} {'phase':<6} {'median':>9} {'mean':>9} {'stdev':>8} {'min':>9} {'p95':>9}  (ms/call)")
+    for name, (build, size) in SCENARIOS.items():
+        if args.scenarios and not any(s in name for s in args.scenarios):
+            continue
+        screen = pygame.display.set_mode(size)
+        random.seed(0)
+        phases = build(screen)
+        results[name] = {}
+        for phase, (prep, fn) in phases.items():
+            r = measure(prep, fn, args.warmup, args.reps, args.inner)
+            results[name][phase] = r
+            print(f"{name:<20} {phase:<6} {r['median_ms']:9.4f} {r['mean_ms']:9.4f} {r['stdev_ms']:8.4f} "
+                  f"{r['min_ms']:9.4f} {r['p95_ms']:9.4f}", flush=True)
+
+    out = Path(args.out or f"bench-{rev}.json")
+    out.write_text(json.dumps({
+        "commit": rev,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "settings": {"warmup": args.warmup, "reps": args.reps, "inner": args.inner},
+        "results": results,
+    }, indent=1))
+    print(f"saved {out}")
+    if args.compare and compare(results, args.compare):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,28 @@
+import argparse
 import pygame
 import random
+import struct
 import sys
+import time
+from collections import deque
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from game_common.input import InputBuffer, filter_events
+from game_common.loop import FixedLoop
+from game_common.profiler import FrameProfiler
+from game_common.scores import EMPTY, ScoreStore, describe
+from game_common.screens import StaticScreen
+from game_common.sprites import COLORKEY, SpriteCache
+from game_common.text import TextCache, HudField
+
 # -------------------- Config --------------------
 WIDTH, HEIGHT = 900, 300
 FPS = 60
+STEP_MS = 8             # fixed simulation step; whole ms so recordings replay exactly
 
 GROUND_Y = HEIGHT - 50
 GRAVITY = 2400          # px/s^2
@@ -18,16 +35,28 @@ SPEED_PER_100M = 30     # +px/s for each 100 m traveled
 
 CACTUS_MIN_GAP = 250
 CACTUS_MAX_GAP = 420
+CACTUS_WIDTHS = (16, 24, 28)
+CACTUS_HEIGHTS = (38, 46, 52)
 PTERO_MIN_GAP = 380
 PTERO_MAX_GAP = 640
 PTERO_MIN_ALT = 30
 PTERO_MAX_ALT = 75
+PTERO_START_PX = 1500   # no pterodactyls for the first 15 m
+PTERO_SPEEDUP = 1.1     # they fly into you a bit faster than the ground moves
 
 CLOUD_MIN_GAP = 180
 CLOUD_MAX_GAP = 360
+CLOUD_PARALLAX = 0.25   # share of world speed clouds drift at
+CLOUD_COUNT = 5         # clouds queued up offscreen at the start
+
+SPAWN_LEAD = 20         # spawns are due this many px before their gap is used up
+SPAWN_CHUNK = 32        # spawns generated per stream at a time
+
+JUMP, DUCK = 1, 2       # input bits, one byte of them per recorded tick
 
 FONT_NAME = "freesansbold.ttf"
-HIGHSCORE_FILE = Path("trex_highscore_m.txt")
+SCORE_GAME = "dino"
+HIGHSCORE_FILE = Path("trex_highscore_m.txt")  # the old one-number store, migrated once
 
 COL_BG = (247, 247, 247)
 COL_TEXT = (60, 60, 60)
@@ -39,82 +68,130 @@ COL_PTERO = (40, 40, 40)
 COL_CLOUD = (220, 220, 220)
 
 # -------------------- Utils --------------------
+TEXT = TextCache(FONT_NAME)
+
 def draw_text(surf, text, size, color, center):
-    font = pygame.font.Font(FONT_NAME, size)
-    ren = font.render(text, True, color)
-    rect = ren.get_rect(center=center)
-    surf.blit(ren, rect)
-
-def load_highscore():
-    try:
-        if HIGHSCORE_FILE.exists():
-            return float(HIGHSCORE_FILE.read_text().strip())
-    except Exception:
-        pass
-    return 0.0
-
-def save_highscore(score):
-    try:
-        HIGHSCORE_FILE.write_text(str(int(score)))
-    except Exception:
-        pass
+    return TEXT.draw(surf, text, size, color, center)
+
+def sweep_hit(a, ady, b, bdx):
+    # Did b, moving left by bdx this frame while a moved down by ady, touch a
+    # at any point of the frame? a and b are where they ended up; motion in
+    # between is taken as a straight line. Solved per axis for the part s of
+    # the way back along the relative motion where the spans overlap.
+    lo, hi = float("-inf"), float("inf")
+    for blo, bhi, alo, ahi, d in ((b.left, b.right, a.left, a.right, bdx),
+                                  (b.top, b.bottom, a.top, a.bottom, ady)):
+        if d == 0:
+            if blo >= ahi or bhi <= alo:
+                return False
+            continue
+        s0, s1 = (alo - bhi) / d, (ahi - blo) / d
+        if d < 0:
+            s0, s1 = s1, s0
+        lo, hi = max(lo, s0), min(hi, s1)
+    return lo < hi and lo < 1 and hi > 0
+
+JUMP_KEYS = {pygame.K_SPACE, pygame.K_UP, pygame.K_w}
+DUCK_KEYS = {pygame.K_DOWN, pygame.K_s}
+
+def read_input(keys):
+    # input bits from the keys down for a step
+    inputs = 0
+    if keys & JUMP_KEYS:
+        inputs |= JUMP
+    if keys & DUCK_KEYS:
+        inputs |= DUCK
+    return inputs
+
+# -------------------- Sprites --------------------
+GROUND_TILE = 48
+
+def bake_ground():
+    # the ground line with its tiny pebbles pattern, one tile wider than the
+    # screen: scrolling is just moving where it gets blitted
+    w = WIDTH + GROUND_TILE
+    surf = pygame.Surface((w, 16))
+    surf.fill(COLORKEY)
+    pygame.draw.line(surf, COL_GROUND, (0, 2), (w, 2), 2)
+    for i in range(w // GROUND_TILE + 1):
+        gx = i * GROUND_TILE
+        pygame.draw.circle(surf, COL_GROUND, (gx + 12, 8), 2)
+        pygame.draw.circle(surf, COL_GROUND, (gx + 30, 12), 2)
+    return surf, (0, 2)
+
+def bake_cloud():
+    surf = pygame.Surface((52, 31))
+    surf.fill(COLORKEY)
+    x, y = 24, 13
+    pygame.draw.circle(surf, COL_CLOUD, (x, y), 12)
+    pygame.draw.circle(surf, COL_CLOUD, (x + 15, y + 4), 10)
+    pygame.draw.circle(surf, COL_CLOUD, (x - 14, y + 6), 9)
+    return surf, (x, y)
+
+GROUND_SPRITE = SpriteCache(bake_ground)
+CLOUD_SPRITE = SpriteCache(bake_cloud)
 
 # -------------------- Entities --------------------
 class Ground:
     def __init__(self):
         self.x = 0
-        self.pattern_w = 48
+        self.pattern_w = GROUND_TILE
+
+        self.dx = 0.0
 
     def update(self, dt, speed):
-        self.x -= speed * dt
+        self.dx = speed * dt
+        self.x -= self.dx
         if self.x <= -self.pattern_w:
             self.x += self.pattern_w
 
-    def draw(self, surf):
-        pygame.draw.line(surf, COL_GROUND, (0, GROUND_Y), (WIDTH, GROUND_Y), 2)
-        # tiny pebbles pattern
-        px = int(self.x)
-        for i in range(-1, WIDTH // self.pattern_w + 2):
-            gx = i * self.pattern_w + px
-            pygame.draw.circle(surf, COL_GROUND, (gx + 12, GROUND_Y + 6), 2)
-            pygame.draw.circle(surf, COL_GROUND, (gx + 30, GROUND_Y + 10), 2)
+    def draw(self, surf, alpha=1.0):
+        x = self.x + self.dx * (1 - alpha)
+        if x > 0:
+            x -= self.pattern_w  # wrapped this step
+        strip, (ax, ay) = GROUND_SPRITE.get()
+        surf.blit(strip, (int(x) - ax, GROUND_Y - ay))
 
 class Cloud:
-    def __init__(self, x):
+    def __init__(self, x, y, speed):
         self.x = x
-        self.y = random.randint(30, 110)
-        self.speed = random.uniform(20, 45)
+        self.y = y
+        self.speed = speed
+        self.dx = 0.0
 
     def update(self, dt, world_speed):
         # slow parallax; not tied 1:1 to world speed
-        self.x -= (world_speed * 0.25 + self.speed) * dt
+        self.dx = (world_speed * CLOUD_PARALLAX + self.speed) * dt
+        self.x -= self.dx
 
-    def draw(self, surf):
-        x, y = int(self.x), int(self.y)
-        pygame.draw.circle(surf, COL_CLOUD, (x, y), 12)
-        pygame.draw.circle(surf, COL_CLOUD, (x + 15, y + 4), 10)
-        pygame.draw.circle(surf, COL_CLOUD, (x - 14, y + 6), 9)
+    def blit_item(self, alpha=1.0):
+        # (sprite, position) for Surface.blits
+        sprite, (ax, ay) = CLOUD_SPRITE.get()
+        return sprite, (int(self.x + self.dx * (1 - alpha)) - ax, int(self.y) - ay)
 
     def off(self):
         return self.x < -50
 
 class Cactus:
-    def __init__(self, x):
+    def __init__(self, x, w, h):
         self.x = x
-        self.w = random.choice([16, 24, 28])
-        self.h = random.choice([38, 46, 52])
+        self.w = w
+        self.h = h
         self.y = GROUND_Y - self.h
+        self.dx = 0.0  # how far it moved last update
+        # little forgiving hitbox, moved along in update rather than rebuilt
+        self.boxes = [pygame.Rect(int(x)+2, int(self.y)+4, w-4, h-4)]
 
     def update(self, dt, speed):
-        self.x -= speed * dt
+        self.dx = speed * dt
+        self.x -= self.dx
+        self.boxes[0].x = int(self.x) + 2
 
     def rects(self):
-        # little forgiving hitbox
-        r = pygame.Rect(int(self.x)+2, int(self.y)+4, self.w-4, self.h-4)
-        return [r]
+        return self.boxes
 
-    def draw(self, surf):
-        x, y, w, h = int(self.x), int(self.y), self.w, self.h
+    def draw(self, surf, alpha=1.0):
+        x, y, w, h = int(self.x + self.dx * (1 - alpha)), int(self.y), self.w, self.h
         pygame.draw.rect(surf, COL_OBST, (x + w//3, y, w//3, h))  # trunk
         # arms
         pygame.draw.rect(surf, COL_OBST, (x, y + h//3, w//3, h//3))
@@ -124,24 +201,28 @@ class Cactus:
         return self.x + self.w < -20
 
 class Pterodactyl:
-    def __init__(self, x):
+    def __init__(self, x, alt):
         self.x = x
-        self.alt = random.randint(PTERO_MIN_ALT, PTERO_MAX_ALT)  # above ground
+        self.alt = alt  # above ground
         self.y = GROUND_Y - self.alt
         self.wing = 0.0
+        self.dx = 0.0
+        # approximate body + head, left to right
+        self.boxes = [pygame.Rect(int(x), int(self.y) - 10, 40, 20),
+                      pygame.Rect(int(x) + 38, int(self.y) - 8, 16, 10)]
 
     def update(self, dt, speed):
-        self.x -= (speed * 1.1) * dt
+        self.dx = (speed * PTERO_SPEEDUP) * dt
+        self.x -= self.dx
         self.wing += dt * 10
+        self.boxes[0].x = int(self.x)
+        self.boxes[1].x = int(self.x) + 38
 
     def rects(self):
-        # approximate body + head
-        body = pygame.Rect(int(self.x), int(self.y) - 10, 40, 20)
-        head = pygame.Rect(int(self.x) + 38, int(self.y) - 8, 16, 10)
-        return [body, head]
+        return self.boxes
 
-    def draw(self, surf):
-        x, y = int(self.x), int(self.y)
+    def draw(self, surf, alpha=1.0):
+        x, y = int(self.x + self.dx * (1 - alpha)), int(self.y)
         # body
         pygame.draw.rect(surf, COL_PTERO, (x, y - 10, 40, 20), border_radius=4)
         # head/beak
@@ -155,10 +236,109 @@ class Pterodactyl:
     def off(self):
         return self.x < -80
 
+# -------------------- Spawning --------------------
+# Each kind of spawn is an endless stream of (gap in px of world distance,
+# constructor args) drawn from its own seeded Random, so a seed pins down
+# the whole course and the streams don't disturb each other.
+def cactus_stream(rng):
+    while True:
+        gap = rng.randint(CACTUS_MIN_GAP, CACTUS_MAX_GAP) - SPAWN_LEAD
+        yield gap, (rng.choice(CACTUS_WIDTHS), rng.choice(CACTUS_HEIGHTS))
+
+def ptero_stream(rng):
+    while True:
+        gap = rng.randint(PTERO_MIN_GAP, PTERO_MAX_GAP) - SPAWN_LEAD
+        yield gap, (rng.randint(PTERO_MIN_ALT, PTERO_MAX_ALT),)
+
+def cloud_stream(rng):
+    # cloud gaps are screen px; they close at roughly the parallax rate
+    while True:
+        gap = rng.randint(CLOUD_MIN_GAP, CLOUD_MAX_GAP)
+        yield gap / CLOUD_PARALLAX, (rng.randint(30, 110), rng.uniform(20, 45))
+
+STREAMS = {"cactus": cactus_stream, "ptero": ptero_stream, "cloud": cloud_stream}
+
+# Upcoming spawns per kind as a queue of (distance_px, args), generated
+# SPAWN_CHUNK at a time. due() pops only what the run has reached, so a
+# frame costs O(1) no matter how many obstacles are on screen, and spawn
+# spacing only depends on distance travelled, not on the frame rate.
+class SpawnSchedule:
+    def __init__(self, seed, start):
+        self.streams = {k: make(random.Random(f"{seed}:{k}")) for k, make in STREAMS.items()}
+        self.last = dict(start)  # distance of the latest queued spawn per kind
+        self.queues = {k: deque() for k in STREAMS}
+
+    def take(self, kind):
+        # the next spawn of `kind` for placing by hand (before anything of
+        # that kind is queued); the schedule carries on behind it
+        gap, args = next(self.streams[kind])
+        self.last[kind] += gap
+        return self.last[kind], args
+
+    def fill(self, kind):
+        queue, stream, at = self.queues[kind], self.streams[kind], self.last[kind]
+        for _ in range(SPAWN_CHUNK):
+            gap, args = next(stream)
+            at += gap
+            queue.append((at, args))
+        self.last[kind] = at
+
+    def due(self, distance):
+        # (kind, px since it was due, args) for everything reached by now
+        for kind, queue in self.queues.items():
+            while True:
+                if not queue:
+                    self.fill(kind)
+                at, args = queue[0]
+                if at > distance:
+                    break
+                queue.popleft()
+                yield kind, distance - at, args
+
+# Obstacles in one lane per kind. Everything in a lane moves at the same
+# speed, so spawn order stays x order: leaving obstacles come off the front
+# and a hit test only looks at the front few that can reach the T-Rex.
+class Course:
+    def __init__(self):
+        self.lanes = {Cactus: deque(), Pterodactyl: deque()}
+
+    def __iter__(self):
+        for lane in self.lanes.values():
+            yield from lane
+
+    def __len__(self):
+        return sum(len(lane) for lane in self.lanes.values())
+
+    def add(self, o):
+        self.lanes[type(o)].append(o)
+
+    def update(self, dt, speed):
+        for lane in self.lanes.values():
+            # dropped a frame late: one that just left still gets swept
+            while lane and lane[0].off():
+                lane.popleft()
+            for o in lane:
+                o.update(dt, speed)
+
+    def hit(self, rect, dy):
+        # rect: the T-Rex now, dy: how far it moved down this frame
+        for lane in self.lanes.values():
+            for o in lane:
+                boxes = o.rects()
+                if boxes[0].left >= rect.right:
+                    break  # this one and everything behind it is still ahead
+                if boxes[-1].right + o.dx <= rect.left:
+                    continue  # already behind the T-Rex for the whole frame
+                for box in boxes:
+                    if sweep_hit(rect, dy, box, o.dx):
+                        return True
+        return False
+
 class Trex:
     def __init__(self):
         self.x = 90
         self.y = GROUND_Y - RUN_H
+        self.prev_y = self.y
         self.vy = 0.0
         self.on_ground = True
         self.ducking = False
@@ -166,19 +346,23 @@ class Trex:
 
     @property
     def rect(self):
+        return self.box(self.y)
+
+    def box(self, y):
         if self.ducking and self.on_ground:
-            return pygame.Rect(self.x, int(self.y + (RUN_H - DUCK_H)), 52, DUCK_H)
+            return pygame.Rect(self.x, int(y + (RUN_H - DUCK_H)), 52, DUCK_H)
         else:
-            return pygame.Rect(self.x, int(self.y), 38, RUN_H)
+            return pygame.Rect(self.x, int(y), 38, RUN_H)
 
-    def update(self, dt, keys):
+    def update(self, dt, jump, duck):
+        self.prev_y = self.y
         self.anim += dt * 10
 
         # Duck only when on ground
-        self.ducking = (keys[pygame.K_DOWN] or keys[pygame.K_s]) and self.on_ground
+        self.ducking = duck and self.on_ground
 
         # Jump
-        if (keys[pygame.K_SPACE] or keys[pygame.K_UP] or keys[pygame.K_w]) and self.on_ground:
+        if jump and self.on_ground:
             self.vy = JUMP_VEL
             self.on_ground = False
 
@@ -191,8 +375,8 @@ class Trex:
                 self.vy = 0
                 self.on_ground = True
 
-    def draw(self, surf):
-        r = self.rect
+    def draw(self, surf, alpha=1.0):
+        r = self.box(self.prev_y + (self.y - self.prev_y) * alpha)
         # body
         pygame.draw.rect(surf, COL_DINO, r, border_radius=4)
 
@@ -211,27 +395,94 @@ class Trex:
         # eye
         pygame.draw.circle(surf, COL_DINO_EYE, (r.x + r.w - 10, r.y + 10), 3)
 
+# -------------------- Recording --------------------
+# A run on disk: RUN_HEADER (magic, version, run seed, how it ended, meters)
+# then one RUN_TICK per update, the step in ms and the input bits.
+# The seed pins down the whole course and nothing else in an update is
+# random, so that is all it takes to play the run again tick for tick.
+RUN_MAGIC = b"DINO"
+RUN_VERSION = 1
+RUN_HEADER = struct.Struct("<4sBqBI")
+RUN_TICK = struct.Struct("<HB")
+
+class RunLog:
+    def __init__(self, seed, ticks=b"", died=False, meters=0):
+        self.seed = seed
+        self.ticks = bytearray(ticks)
+        self.died = died
+        self.meters = meters
+
+    def __len__(self):
+        return len(self.ticks) // RUN_TICK.size
+
+    def __iter__(self):
+        # (ms, inputs) per tick
+        return RUN_TICK.iter_unpack(self.ticks)
+
+    def add(self, ms, inputs):
+        self.ticks += RUN_TICK.pack(ms, inputs)
+
+    def save(self, path):
+        header = RUN_HEADER.pack(RUN_MAGIC, RUN_VERSION, self.seed, self.died, self.meters)
+        Path(path).write_bytes(header + self.ticks)
+
+    @classmethod
+    def load(cls, path):
+        data = Path(path).read_bytes()
+        if len(data) < RUN_HEADER.size:
+            raise ValueError(f"{path}: not a dino run")
+        magic, version, seed, died, meters = RUN_HEADER.unpack_from(data)
+        if magic != RUN_MAGIC or version != RUN_VERSION:
+            raise ValueError(f"{path}: not a dino run (or a newer version)")
+        end = RUN_HEADER.size + (len(data) - RUN_HEADER.size) // RUN_TICK.size * RUN_TICK.size
+        return cls(seed, data[RUN_HEADER.size:end], bool(died), meters)
+
 # -------------------- Game --------------------
 class Game:
-    def __init__(self, screen):
+    def __init__(self, screen, seed=None, record=None, turbo=1.0, scores=None):
         self.screen = screen
-        self.clock = pygame.time.Clock()
+        self.scores = scores  # ScoreStore for finished runs; None keeps nothing
+        self.seed = seed
+        self.record = Path(record) if record is not None else None  # folder for run logs
+        self.log = None
+        self.loop = FixedLoop(STEP_MS / 1000.0, FPS, turbo)
+        self.loop.bind(self.handle_events, self.step, self.render, self.idle)
+        self.input = InputBuffer(JUMP_KEYS | DUCK_KEYS)
+        self.profiler = FrameProfiler(self.loop, [
+            (self, "draw_game", "draw"), (self, "draw_hud", "hud"), (Ground, "draw", "ground"),
+            (Cactus, "draw", "obstacles"), (Pterodactyl, "draw", "obstacles"), (Trex, "draw", "trex"),
+            (Course, "hit", "collide"),
+        ], inputs=self.input)
         self.state = "MENU"
-        self.highscore_m = load_highscore()   # meters
+        self.highscore_m = 0   # meters
+        if scores is not None:
+            scores.track(SCORE_GAME, HIGHSCORE_FILE)
+        self.hud_dist = HudField(TEXT, "DIST: {} m", 22, COL_TEXT, (90, 24))
+        self.hud_speed = HudField(TEXT, "SPEED: {} px/s", 18, (90, 90, 90), (260, 24))
+        self.hud_best = HudField(TEXT, "BEST: {} m", 18, (120, 120, 120), (WIDTH - 90, 24))
+        self.menu_screen = StaticScreen(screen, self.render_menu)
+        self.game_over_screen = StaticScreen(screen, self.render_game_over)
+        self.runs = 0
         self.reset()
 
     def reset(self):
+        self.save_run()
+        self.input.clear()  # the press that started the run isn't a jump
+        self.runs += 1
+        # a fixed --seed replays the same course every run
+        self.run_seed = self.seed if self.seed is not None else random.getrandbits(32)
+        if self.record is not None:
+            self.log = RunLog(self.run_seed)
         self.trex = Trex()
         self.ground = Ground()
-        self.clouds = []
-        x = 0
-        for _ in range(5):
-            x += random.randint(CLOUD_MIN_GAP, CLOUD_MAX_GAP)
-            self.clouds.append(Cloud(WIDTH + x))
 
-        self.obstacles = []
-        self.spawn_x_cactus = WIDTH + random.randint(CACTUS_MIN_GAP, CACTUS_MAX_GAP)
-        self.spawn_x_ptero  = WIDTH + random.randint(PTERO_MIN_GAP, PTERO_MAX_GAP)
+        self.spawns = SpawnSchedule(self.run_seed, {"cactus": 0.0, "ptero": PTERO_START_PX, "cloud": 0.0})
+        # a few clouds lined up offscreen, the schedule carries on behind them
+        self.clouds = []
+        for _ in range(CLOUD_COUNT):
+            at, args = self.spawns.take("cloud")
+            self.clouds.append(Cloud(WIDTH + at * CLOUD_PARALLAX, *args))
+        self.obstacles = Course()
 
         self.distance_px = 0.0
         self.speed = BASE_SPEED
@@ -241,39 +492,35 @@ class Game:
 
     # ---------- Spawning ----------
     def maybe_spawn(self):
-        # spawn cacti
-        if not any(isinstance(o, Cactus) and o.x > self.spawn_x_cactus - 150 for o in self.obstacles):
-            if self.spawn_x_cactus < WIDTH + 20:
-                self.obstacles.append(Cactus(WIDTH + 10))
-                gap = random.randint(CACTUS_MIN_GAP, CACTUS_MAX_GAP)
-                self.spawn_x_cactus = WIDTH + gap
+        # whatever came due since last frame, moved on by how late it is
+        for kind, late, args in self.spawns.due(self.distance_px):
+            if kind == "cactus":
+                self.obstacles.add(Cactus(WIDTH + 10 - late, *args))
+            elif kind == "ptero":
+                self.obstacles.add(Pterodactyl(WIDTH + 10 - late * PTERO_SPEEDUP, *args))
             else:
-                self.spawn_x_cactus -= self.speed / FPS
-
-        # spawn pterodactyls after 150 m to ease early game
-        meters = self.distance_px / 100.0
-        if meters >= 150 / 10:
-            if not any(isinstance(o, Pterodactyl) and o.x > self.spawn_x_ptero - 200 for o in self.obstacles):
-                if self.spawn_x_ptero < WIDTH + 20:
-                    self.obstacles.append(Pterodactyl(WIDTH + 10))
-                    gap = random.randint(PTERO_MIN_GAP, PTERO_MAX_GAP)
-                    self.spawn_x_ptero = WIDTH + gap
-                else:
-                    self.spawn_x_ptero -= self.speed / FPS
-
-        # clouds
-        if (len(self.clouds) == 0) or (self.clouds[-1].x < WIDTH - random.randint(CLOUD_MIN_GAP, CLOUD_MAX_GAP)):
-            self.clouds.append(Cloud(WIDTH + 40))
+                self.clouds.append(Cloud(WIDTH + 40 - late * CLOUD_PARALLAX, *args))
 
     # ---------- Update / Draw ----------
-    def update(self, dt):
+    def update(self, dt, inputs=0):
         if self.state != "PLAY":
             return
 
         self.elapsed += dt
 
-        keys = pygame.key.get_pressed()
-        self.trex.update(dt, keys)
+        self.trex.update(dt, inputs & JUMP, inputs & DUCK)
+        self.advance(dt)
+
+        # collisions, swept over the whole step so nothing slips through
+        if self.obstacles.hit(self.trex.rect, self.trex.y - self.trex.prev_y):
+            self.state = "GAME_OVER"
+            dist_m = int(self.distance_px / 100.0)
+            self.highscore_m = max(self.highscore_m, dist_m)
+            if self.scores is not None:
+                self.scores.add(SCORE_GAME, dist_m, self.elapsed, self.run_seed)
+
+    def advance(self, dt):
+        # everything but the T-Rex: speed, scenery, obstacles, spawns
 
         # world speed grows with distance: +SPEED_PER_100M for each 100 meters
         meters = self.distance_px / 100.0
@@ -286,9 +533,7 @@ class Game:
             cl.update(dt, self.speed)
             if cl.off(): self.clouds.remove(cl)
 
-        for o in list(self.obstacles):
-            o.update(dt, self.speed)
-            if o.off(): self.obstacles.remove(o)
+        self.obstacles.update(dt, self.speed)
 
         # distance accumulation:
         # define 100 px = 1 meter (so m = px/100)
@@ -296,51 +541,55 @@ class Game:
 
         self.maybe_spawn()
 
-        # collisions
-        trex_r = self.trex.rect
-        hit = False
-        for o in self.obstacles:
-            for r in o.rects():
-                if trex_r.colliderect(r):
-                    hit = True
-                    break
-            if hit: break
-
-        if hit:
-            self.state = "GAME_OVER"
-            dist_m = int(self.distance_px / 100.0)
-            if dist_m > self.highscore_m:
-                self.highscore_m = dist_m
-                save_highscore(self.highscore_m)
+    # ---------- Recording ----------
+    def save_run(self):
+        # write out the run being recorded, if it got anywhere
+        log, self.log = self.log, None
+        if log is None or not len(log):
+            return
+        log.died = self.state == "GAME_OVER"
+        log.meters = int(self.distance_px / 100.0)
+        self.record.mkdir(parents=True, exist_ok=True)
+        log.save(self.record / f"run-{time.strftime('%Y%m%d-%H%M%S')}-{self.runs}-{log.seed}.dino")
 
     def draw_hud(self):
         # distance and speed
         dist_m = int(self.distance_px / 100.0)
-        draw_text(self.screen, f"DIST: {dist_m} m", 22, COL_TEXT, (90, 24))
-        draw_text(self.screen, f"SPEED: {int(self.speed)} px/s", 18, (90, 90, 90), (260, 24))
-        draw_text(self.screen, f"BEST: {int(self.highscore_m)} m", 18, (120, 120, 120), (WIDTH - 90, 24))
+        self.hud_dist.draw(self.screen, dist_m)
+        self.hud_speed.draw(self.screen, int(self.speed))
+        self.hud_best.draw(self.screen, int(self.highscore_m))
 
-    def draw_game(self):
+    def draw_game(self, alpha=1.0):
+        # alpha: how far between the last two updates to draw things
         self.screen.fill(COL_BG)
 
-        # clouds (back)
-        for cl in self.clouds:
-            cl.draw(self.screen)
+        # clouds (back), all in one call
+        self.screen.blits([cl.blit_item(alpha) for cl in self.clouds], doreturn=False)
 
         # ground & pebbles
-        self.ground.draw(self.screen)
+        self.ground.draw(self.screen, alpha)
 
         # obstacles
         for o in self.obstacles:
-            o.draw(self.screen)
+            o.draw(self.screen, alpha)
 
         # T-Rex
-        self.trex.draw(self.screen)
+        self.trex.draw(self.screen, alpha)
 
         # HUD
         self.draw_hud()
 
+    def leaderboard(self):
+        # latest leaderboard; its best can be ahead of this session's
+        board = self.scores.board(SCORE_GAME) if self.scores is not None else EMPTY
+        self.highscore_m = max(self.highscore_m, board.best)
+        return board
+
     def draw_menu(self):
+        self.leaderboard()
+        self.menu_screen.draw((int(self.highscore_m),))
+
+    def render_menu(self):
         self.screen.fill(COL_BG)
         draw_text(self.screen, "T-Rex Desert Run", 42, COL_TEXT, (WIDTH // 2, HEIGHT // 3 - 10))
         draw_text(self.screen, "Jump over cactuses • Dodge pterodactyls", 20, (100, 100, 100), (WIDTH // 2, HEIGHT // 3 + 32))
@@ -357,6 +606,10 @@ class Game:
         pygame.draw.line(self.screen, COL_GROUND, (0, GROUND_Y), (WIDTH, GROUND_Y), 2)
 
     def draw_game_over(self):
+        # the frozen scene belongs to this run, so the run counter is part of the key
+        self.game_over_screen.draw((self.runs, int(self.distance_px), self.leaderboard()))
+
+    def render_game_over(self):
         self.draw_game()
         # overlay
         overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
@@ -368,51 +621,89 @@ class Game:
         draw_text(self.screen, f"Distance: {dist_m} m", 26, COL_TEXT, (WIDTH // 2, HEIGHT // 2 + 6))
         draw_text(self.screen, f"Best: {int(self.highscore_m)} m", 20, (90, 90, 90), (WIDTH // 2, HEIGHT // 2 + 36))
         draw_text(self.screen, "R / ENTER / SPACE: Retry   •   M: Menu   •   Q: Quit", 18, (60,60,60), (WIDTH // 2, HEIGHT // 2 + 70))
+        lines = describe(self.leaderboard(), " m")
+        if lines:
+            draw_text(self.screen, "   •   ".join(lines), 16, (90, 90, 90), (WIDTH // 2, HEIGHT // 2 + 100))
 
     # ---------------- Loop & Input ----------------
     def handle_events(self):
         for e in pygame.event.get():
             if e.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
+                pygame.event.post(e)  # for a launcher running the game
+                self.quit_game()
+                return
+            self.input.feed(e)
+            if self.profiler.handle(e):
+                continue
             if e.type == pygame.KEYDOWN:
                 if self.state == "MENU":
                     if e.key in (pygame.K_RETURN, pygame.K_SPACE):
                         self.state = "PLAY"; self.reset()
                     elif e.key == pygame.K_q:
-                        pygame.quit(); sys.exit()
+                        self.quit_game()
                 elif self.state == "PLAY":
                     if e.key in (pygame.K_ESCAPE,):
                         self.state = "MENU"
+                        self.save_run()
                 elif self.state == "GAME_OVER":
                     if e.key in (pygame.K_r, pygame.K_RETURN, pygame.K_SPACE):
                         self.state = "PLAY"; self.reset()
                     elif e.key == pygame.K_m:
                         self.state = "MENU"
                     elif e.key == pygame.K_q:
-                        pygame.quit(); sys.exit()
+                        self.quit_game()
 
-    def run(self):
-        while True:
-            dt = self.clock.tick(FPS) / 1000.0
-            self.handle_events()
-            if self.state == "PLAY":
-                self.update(dt)
+    def quit_game(self):
+        # back to whoever started the game: the script ends, a launcher carries on
+        self.loop.stop()
 
-            if self.state == "MENU":
-                self.draw_menu()
-            elif self.state == "PLAY":
-                self.draw_game()
-            elif self.state == "GAME_OVER":
-                self.draw_game_over()
+    def idle(self):
+        return self.state != "PLAY"
 
-            pygame.display.flip()
+    def step(self, dt):
+        # one fixed update with the keys down since the last one
+        inputs = read_input(self.input.step())
+        if self.log is not None:
+            self.log.add(STEP_MS, inputs)
+        self.update(dt, inputs)
+        if self.state != "PLAY":
+            self.save_run()
+
+    def render(self, alpha):
+        if self.state == "MENU":
+            self.draw_menu()
+        elif self.state == "PLAY":
+            self.draw_game(alpha)
+        elif self.state == "GAME_OVER":
+            self.draw_game_over()
+
+        pygame.display.flip()
+        self.input.presented()
+
+    def run(self):
+        try:
+            self.loop.run()
+        finally:
+            self.save_run()  # quitting mid-run still keeps the recording
 
 # -------------------- Entrypoint --------------------
 def main():
-    pygame.init()
+    parser = argparse.ArgumentParser(description="T-Rex Desert Run")
+    parser.add_argument("--seed", type=int, help="same obstacle course on every run")
+    parser.add_argument("--record", metavar="DIR", help="save every run's inputs here for dino_pygame.replay")
+    parser.add_argument("--turbo", type=float, default=1.0, help="simulated seconds per real second")
+    parser.add_argument("--profile", action="store_true", help="start with the frame profiler on (F3 toggles, F4 dumps)")
+    args = parser.parse_args()
+
+    pygame.display.init()  # just what the game uses: no audio, joystick, ...
+    pygame.font.init()
+    filter_events()
     pygame.display.set_caption("T-Rex Desert Run — Start Menu & Died Screen")
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
-    Game(screen).run()
+    game = Game(screen, seed=args.seed, record=args.record, turbo=args.turbo, scores=ScoreStore())
+    if args.profile:
+        game.profiler.toggle()
+    game.run()
 
 if __name__ == "__main__":
     main()
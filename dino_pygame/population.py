@@ -0,0 +1,232 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from dino_pygame.dino import (DUCK, DUCK_H, GRAVITY, GROUND_Y, JUMP, JUMP_VEL, RUN_H, STEP_MS, Game,
+                              Pterodactyl)
+
+# N T-Rexes on one shared course. The world (speed, obstacles, spawns) is a
+# plain Game stepped with Game.advance; the T-Rexes are arrays and run the
+# same physics and swept collision as Trex.update / Course.hit, all agents
+# in one pass. Agents don't see or touch each other, so every agent plays
+# exactly the run a single Game would with the same inputs.
+
+TREX_X = 90
+RUN_W, DUCK_W = 38, 52  # hitbox widths, as in Trex.rect
+
+# observation columns; next_* describe the closest obstacle not yet passed
+OBS_FIELDS = ("y", "vy", "on_ground", "speed",
+              "next_dx", "next_w", "next_top", "next_bottom", "next_ptero")
+NO_OBSTACLE = (10000.0, 0.0, 0.0, 0.0, 0.0)
+
+class TrexPopulation:
+    def __init__(self, n, seed=None):
+        self.n = n
+        self.world = Game(None, seed=seed)
+        self.reset()
+
+    def reset(self):
+        n = self.n
+        self.world.state = "PLAY"
+        self.world.reset()
+        self.y = np.full(n, float(GROUND_Y - RUN_H))
+        self.vy = np.zeros(n)
+        self.on_ground = np.ones(n, bool)
+        self.ducking = np.zeros(n, bool)
+        self.alive = np.ones(n, bool)
+        self.death_px = np.full(n, np.nan)  # world distance when each agent died
+        self.ticks = 0
+        return self.observe()
+
+    # ---------- one tick ----------
+    def step(self, dt, actions):
+        # actions: JUMP / DUCK input bits per agent; dead agents are ignored
+        actions = np.asarray(actions)
+        alive = self.alive
+        y0 = self.y.copy()
+
+        # Trex.update for everyone still running
+        self.ducking = alive & ((actions & DUCK) != 0) & self.on_ground
+        jump = alive & ((actions & JUMP) != 0) & self.on_ground
+        self.vy[jump] = JUMP_VEL
+        self.on_ground &= ~jump
+        air = alive & ~self.on_ground
+        self.vy[air] += GRAVITY * dt
+        self.y[air] += self.vy[air] * dt
+        landed = air & (self.y >= GROUND_Y - RUN_H)
+        self.y[landed] = GROUND_Y - RUN_H
+        self.vy[landed] = 0
+        self.on_ground |= landed
+
+        self.world.advance(dt)
+        self.ticks += 1
+
+        hit = self.hit(self.y - y0) & alive
+        self.alive &= ~hit
+        self.death_px[hit] = self.world.distance_px
+        return hit
+
+    def rects(self):
+        # (top, bottom, right) of every agent's hitbox; left is always TREX_X
+        duck = self.ducking & self.on_ground
+        top = np.where(duck, self.y + (RUN_H - DUCK_H), self.y).astype(np.int64)
+        bottom = top + np.where(duck, DUCK_H, RUN_H)
+        right = TREX_X + np.where(duck, DUCK_W, RUN_W)
+        return top, bottom, right
+
+    def hit(self, dy):
+        # Course.hit with the same broad phase, then sweep_hit for all
+        # agents against each box that could reach any of them
+        top, bottom, right = self.rects()
+        hit = np.zeros(self.n, bool)
+        for lane in self.world.obstacles.lanes.values():
+            for o in lane:
+                boxes = o.rects()
+                if boxes[0].left >= TREX_X + DUCK_W:
+                    break
+                if boxes[-1].right + o.dx <= TREX_X:
+                    continue
+                for box in boxes:
+                    hit |= sweep_hits(top, bottom, right, dy, box, o.dx)
+        return hit
+
+    # ---------- observations ----------
+    def next_obstacle(self):
+        best = None
+        for lane in self.world.obstacles.lanes.values():
+            for o in lane:
+                boxes = o.rects()
+                if boxes[-1].right > TREX_X:
+                    if best is None or boxes[0].left < best[0].left:
+                        best = (boxes[0], boxes[-1], o)
+                    break  # lanes are in x order
+        if best is None:
+            return NO_OBSTACLE
+        first, last, o = best
+        top = min(b.top for b in o.rects())
+        bottom = max(b.bottom for b in o.rects())
+        return (first.left - TREX_X, last.right - first.left, top, bottom, float(isinstance(o, Pterodactyl)))
+
+    def observe(self):
+        # (n, len(OBS_FIELDS)) float32; the obstacle columns are shared
+        obs = np.empty((self.n, len(OBS_FIELDS)), np.float32)
+        obs[:, 0] = self.y
+        obs[:, 1] = self.vy
+        obs[:, 2] = self.on_ground
+        obs[:, 3] = self.world.speed
+        obs[:, 4:] = self.next_obstacle()
+        return obs
+
+    def meters(self):
+        # distance at death per agent; survivors get the distance so far
+        px = np.where(self.alive, self.world.distance_px, self.death_px)
+        return (px / 100.0).astype(np.int64)
+
+    def run(self, policy, dt=STEP_MS / 1000.0, max_seconds=None):
+        # policy(obs, alive) -> input bits per agent, until everyone is dead
+        obs = self.observe()
+        limit = None if max_seconds is None else int(max_seconds / dt)
+        while self.alive.any() and (limit is None or self.ticks < limit):
+            self.step(dt, policy(obs, self.alive))
+            obs = self.observe()
+        return self.meters()
+
+def sweep_hits(top, bottom, right, dy, b, bdx):
+    # sweep_hit for every agent at once: the agents span [TREX_X, right) x
+    # [top, bottom) and moved down by dy; b moved left by bdx
+    lo, hi = slab(b.left, b.right, TREX_X, right, bdx)
+    ylo, yhi = slab(b.top, b.bottom, top, bottom, dy)
+    lo, hi = np.maximum(lo, ylo), np.minimum(hi, yhi)
+    return (lo < hi) & (lo < 1) & (hi > 0)
+
+def slab(blo, bhi, alo, ahi, d):
+    # per axis: the part s of the way back along the motion where the spans
+    # overlap; with no motion, always or never
+    d = np.broadcast_to(np.asarray(d, float), np.shape(ahi))
+    moving = d != 0
+    safe = np.where(moving, d, 1.0)
+    s0, s1 = (alo - bhi) / safe, (ahi - blo) / safe
+    overlap = (blo < ahi) & (bhi > alo)
+    lo = np.where(moving, np.minimum(s0, s1), np.where(overlap, -np.inf, np.inf))
+    hi = np.where(moving, np.maximum(s0, s1), np.where(overlap, np.inf, -np.inf))
+    return lo, hi
+
+# ---------------- Demo policy ----------------
+# One gene per agent: how many px ahead of an obstacle it jumps (or ducks,
+# for a pterodactyl it can't clear). Enough to see a spread of distances.
+def threshold_policy(genes):
+    def policy(obs, alive):
+        dx, w, bottom, ptero = obs[:, 4], obs[:, 5], obs[:, 7], obs[:, 8] > 0
+        close = (dx + w > 0) & (dx < genes)
+        high = ptero & (bottom < GROUND_Y - DUCK_H)
+        return np.where(close & ~high, JUMP, 0) | np.where(close & high, DUCK, 0)
+    return policy
+
+# ---------------- Parity check ----------------
+# Plays a plain Game per agent with the inputs that agent was given: each
+# must die on the same tick, at the very same distance, as in the batch.
+# Raises RuntimeError on the first agent that doesn't.
+def parity_check(agents=64, seed=0, max_seconds=120.0):
+    dt = STEP_MS / 1000.0
+    rng = np.random.default_rng(seed)
+    smart = threshold_policy(rng.uniform(20, 260, agents))
+    pop = TrexPopulation(agents, seed=seed)
+    limit = int(max_seconds / dt)
+    history = []
+    obs = pop.observe()
+    while pop.alive.any() and pop.ticks < limit:
+        actions = smart(obs, pop.alive)
+        noise = rng.random(agents) < 0.05  # some random presses, ducks included
+        actions = np.where(noise, rng.integers(0, 4, agents), actions)
+        history.append(actions)
+        pop.step(dt, actions)
+        obs = pop.observe()
+    for i in range(agents):
+        game = Game(None, seed=seed)
+        game.state = "PLAY"
+        game.reset()
+        for actions in history:
+            game.update(dt, int(actions[i]))
+            if game.state != "PLAY":
+                break
+        if (game.state == "PLAY") != pop.alive[i]:
+            raise RuntimeError(f"agent {i}: alive differs")
+        if not pop.alive[i] and game.distance_px != pop.death_px[i]:
+            raise RuntimeError(f"agent {i}: died at {game.distance_px} vs {pop.death_px[i]}")
+    return agents, pop.ticks
+
+def main():
+    parser = argparse.ArgumentParser(description="Many T-Rexes on one course")
+    parser.add_argument("--check", action="store_true", help="run the parity check against Game")
+    parser.add_argument("--agents", type=int, default=4096)
+    parser.add_argument("--seconds", type=float, default=120.0, help="simulated time limit")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.check:
+        try:
+            agents, ticks = parity_check(seed=args.seed)
+        except RuntimeError as e:
+            sys.exit(f"parity check failed: {e}")
+        print(f"parity ok for {agents} agents over {ticks} ticks")
+        return
+    genes = np.random.default_rng(args.seed).uniform(20, 260, args.agents)
+    pop = TrexPopulation(args.agents, seed=args.seed)
+    t0 = time.perf_counter()
+    meters = pop.run(threshold_policy(genes), max_seconds=args.seconds)
+    elapsed = time.perf_counter() - t0
+    best = int(np.argmax(meters))
+    print(f"{args.agents} agents, {pop.ticks} ticks in {elapsed:.2f} s: "
+          f"{args.agents * pop.ticks / elapsed / 1e6:.2f} M agent-ticks/s")
+    print(f"distance m: median {int(np.median(meters))}, best {meters[best]} (gene {genes[best]:.0f} px), "
+          f"{int(pop.alive.sum())} still running")
+
+if __name__ == "__main__":
+    main()
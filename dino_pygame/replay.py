@@ -0,0 +1,82 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from dino_pygame.dino import Game, RunLog
+
+# Plays recorded runs (dino.py --record DIR) again without a window, as
+# fast as the updates go. A run checks out when it dies on exactly its last
+# tick at the distance it was saved with; anything else means the game no
+# longer plays that run the same way. Update time per simulated second is
+# the number to watch for performance regressions.
+
+def replay(log, repeat=1):
+    best = None
+    for _ in range(repeat):
+        game = Game(None, seed=log.seed)
+        game.state = "PLAY"
+        game.reset()
+        ticks = sim = 0
+        t0 = time.perf_counter()
+        for ms, inputs in log:
+            if game.state != "PLAY":
+                break
+            game.update(ms / 1000.0, inputs)
+            ticks += 1
+            sim += ms
+        spent = time.perf_counter() - t0
+        best = spent if best is None else min(best, spent)
+    meters = int(game.distance_px / 100.0)
+    died = game.state == "GAME_OVER"
+    ok = ticks == len(log) and died == log.died and meters == log.meters
+    return {
+        "seed": log.seed,
+        "ticks": ticks,
+        "sim_s": sim / 1000.0,
+        "wall_s": best,
+        "died": died,
+        "meters": meters,
+        "ok": ok,
+    }
+
+def run_files(paths):
+    for p in paths:
+        p = Path(p)
+        if p.is_dir():
+            yield from sorted(p.glob("*.dino"))
+        else:
+            yield p
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded T-Rex runs headless")
+    parser.add_argument("runs", nargs="+", help="run files, or folders of them")
+    parser.add_argument("--repeat", type=int, default=1, help="time each run this many times, keep the best")
+    args = parser.parse_args()
+
+    print(f"{'run':<40} {'seed':>10} {'ticks':>7} {'meters':>6} {'sim s':>7} {'x real':>7} {'ms/sim s':>8}")
+    bad = total_sim = total_wall = 0
+    for path in run_files(args.runs):
+        log = RunLog.load(path)
+        r = replay(log, args.repeat)
+        total_sim += r["sim_s"]
+        total_wall += r["wall_s"]
+        speedup = r["sim_s"] / r["wall_s"] if r["wall_s"] else 0.0
+        cost = r["wall_s"] * 1000.0 / r["sim_s"] if r["sim_s"] else 0.0
+        note = ""
+        if not r["ok"]:
+            bad += 1
+            note = f"  MISMATCH: saved {len(log)} ticks, {log.meters} m, {'died' if log.died else 'alive'}"
+        print(f"{path.name:<40} {r['seed']:>10} {r['ticks']:>7} {r['meters']:>6} {r['sim_s']:>7.1f} "
+              f"{speedup:>7.0f} {cost:>8.3f}{note}", flush=True)
+    if total_sim:
+        print(f"total {total_sim:.1f} simulated s in {total_wall:.2f} s: "
+              f"{total_sim / total_wall:.0f}x real time, {total_wall * 1000.0 / total_sim:.3f} ms per simulated s")
+    sys.exit(1 if bad else 0)
+
+if __name__ == "__main__":
+    main()
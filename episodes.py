@@ -0,0 +1,285 @@
+import argparse
+import ast
+import importlib
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+# Thousands of headless episodes of one game, sharded by seed over worker
+# processes. An episode builds the game with no screen, puts it in PLAY and
+# steps its own update at the game's fixed dt with a scripted player until
+# the run ends (or hits --max-seconds); nothing is drawn. Episodes share
+# nothing and each result is a few numbers, so throughput grows with the
+# number of cores. Results stream back in seed order as chunks finish.
+#
+#   python episodes.py dino --episodes 5000 --set CACTUS_MIN_GAP=300
+#   python episodes.py snake --policy mypolicies:hunter --out runs.jsonl
+
+MODULES = {
+    "flower": "flower_pygame.flower_game",
+    "snake": "snaketail_pygame.snake_game",
+    "dino": "dino_pygame.dino",
+}
+MAX_SECONDS = 600.0  # simulated; an episode still running then is cut off
+CHUNKS_PER_WORKER = 8  # smaller chunks stream sooner, bigger ones cost less to hand out
+DINO_W = 38  # the T-Rex's hitbox width running or in the air (Trex.box)
+DINO_MARGIN_PX = 2  # slack around every hitbox for whole-pixel boxes and sweeps
+DINO_PLAN_DEPTH = 4  # jumps planned ahead, enough for everything on screen
+DINO_PLAN_STEPS = 2  # jump times tried this many steps apart
+DINO_REACT_STEPS = 4  # jump while waiting this long would still leave a way through
+
+# ---------------- Scripted players ----------------
+# policy(game) -> what the player does this step: a Basket.steer direction,
+# a snake direction or dino input bits. --policy module:function plugs in
+# another one with the same signature.
+def flower_chase(game):
+    # under the lowest flower still above the basket
+    field, b = game.field, game.basket
+    y = field.y[:field.n]
+    above = np.flatnonzero(y < b.y)
+    if not len(above):
+        return 0
+    i = above[np.argmax(y[above])]
+    dx = field.x[i] - (b.x + b.w / 2)
+    return 0 if abs(dx) < b.w / 4 else (1 if dx > 0 else -1)
+
+def snake_greedy(game):
+    # the free neighbour closest to the food on the wrapping board
+    sg = sys.modules[MODULES["snake"]]
+    w, h = game.grid_w, game.grid_h
+    head, tail = game.snake[0], game.snake[-1]
+    fy, fx = divmod(game.food, w)
+    best = None
+    for d in sg.DIRS:
+        if d == (-game.dir[0], -game.dir[1]):
+            continue
+        cell = sg.step_cell(head, d, w, h)
+        if game.occupied[cell] and cell != tail:
+            continue
+        cy, cx = divmod(cell, w)
+        dist = min(abs(cx - fx), w - abs(cx - fx)) + min(abs(cy - fy), h - abs(cy - fy))
+        if best is None or dist < best[0]:
+            best = (dist, d)
+    return game.dir if best is None else best[1]
+
+def snake_autopilot(game):
+    # the in-game autopilot; it plans against a wall-clock budget, so runs
+    # are not exactly repeatable
+    if game.autopilot is None:
+        game.toggle_autopilot()
+    return game.autopilot.choose(game)
+
+# A jump can't be cut short and lasts about as long as the gap between two
+# close obstacles, so when to jump depends on everything behind the next
+# one too. Each hitbox ahead becomes (enters, leaves, low, high): the
+# seconds from now it overlaps the T-Rex's column and the span above the
+# ground it covers. A jump's arc is a parabola, so whether it clears a box
+# comes from the arc's heights at the ends of the box's window and at the
+# apex, and a short search over jump times says whether the T-Rex can get
+# past everything it has to jump.
+def dino_boxes(game, dino):
+    out = []
+    x = game.trex.x
+    for o in game.obstacles:
+        speed = game.speed * (dino.PTERO_SPEEDUP if isinstance(o, dino.Pterodactyl) else 1.0)
+        for b in o.rects():
+            if b.right + DINO_MARGIN_PX <= x:
+                continue
+            out.append(((b.left - DINO_MARGIN_PX - x - DINO_W) / speed, (b.right + DINO_MARGIN_PX - x) / speed,
+                        dino.GROUND_Y - b.bottom - DINO_MARGIN_PX, dino.GROUND_Y - b.top + DINO_MARGIN_PX))
+    return out
+
+def jump_height(dino, t):
+    # feet above the ground t s into a jump
+    return max(0.0, -dino.JUMP_VEL * t - dino.GRAVITY * t * t / 2)
+
+def jump_clear(dino, boxes, at, air):
+    # does a jump at `at` s from now miss every box while in the air
+    for enters, leaves, low, high in boxes:
+        a, b = enters - at, leaves - at
+        if b <= 0 or a >= air:
+            continue
+        ha, hb = jump_height(dino, a), jump_height(dino, b)
+        top = jump_height(dino, air / 2) if a < air / 2 < b else max(ha, hb)
+        if min(ha, hb) < high and top > low - dino.RUN_H:
+            return False
+    return True
+
+def way_through(dino, boxes, ground, depth, air, step):
+    # on the ground from `ground` s on: can jumps, the latest first, clear
+    # every box the T-Rex can't duck under
+    first = None
+    for box in boxes:
+        if box[2] < dino.DUCK_H and box[1] > ground and (first is None or box[0] < first[0]):
+            first = box
+    if first is None or depth == 0:
+        return True
+    at = first[0]
+    while at >= max(ground, first[1] - air):
+        if jump_clear(dino, boxes, at, air) and way_through(dino, boxes, at + air, depth - 1, air, step):
+            return True
+        at -= step
+    return False
+
+def dino_jumper(game):
+    # jump at the last moment that keeps a way through, duck under
+    # pterodactyls a running T-Rex would hit; in the air nothing else helps
+    dino = sys.modules[MODULES["dino"]]
+    if not game.trex.on_ground:
+        return 0
+    step = dino.STEP_MS / 1000.0
+    air = 2 * -dino.JUMP_VEL / dino.GRAVITY
+    boxes = dino_boxes(game, dino)
+    if (not way_through(dino, boxes, DINO_REACT_STEPS * step, DINO_PLAN_DEPTH, air, DINO_PLAN_STEPS * step)
+            and jump_clear(dino, boxes, 0.0, air)):
+        return dino.JUMP
+    if any(enters <= step and dino.DUCK_H <= low < dino.RUN_H for enters, _, low, _ in boxes):
+        return dino.DUCK
+    return 0
+
+POLICIES = {
+    "flower": {"chase": flower_chase},
+    "snake": {"greedy": snake_greedy, "autopilot": snake_autopilot},
+    "dino": {"jumper": dino_jumper},
+}
+
+def resolve_policy(game, name):
+    if name is None:
+        return next(iter(POLICIES[game].values()))
+    if name in POLICIES[game]:
+        return POLICIES[game][name]
+    module, _, attr = name.partition(":")
+    return getattr(importlib.import_module(module), attr)
+
+# ---------------- Episodes ----------------
+def flower_episode(fg, seed, policy, max_seconds):
+    game = fg.Game(None, seed=seed)
+    game.state = "PLAY"
+    game.reset()
+    dt, ticks, limit = 1.0 / fg.FPS, 0, int(max_seconds * fg.FPS)
+    while game.state == "PLAY" and ticks < limit:
+        game.update(dt, policy(game))
+        ticks += 1
+    return game.score, game.elapsed, ticks, game.state != "PLAY"
+
+def snake_episode(sg, seed, policy, max_seconds):
+    random.seed(seed)  # food placement
+    game = sg.SnakeGame(None)
+    game.state = "PLAY"
+    game.reset()
+    ticks = 0
+    while game.state == "PLAY" and game.elapsed < max_seconds:
+        game.next_dir = policy(game)
+        game.tick(game.loop.step)  # the step shortens as the snake grows, like in play
+        ticks += 1
+    return game.score, game.elapsed, ticks, game.state != "PLAY"
+
+def dino_episode(dino, seed, policy, max_seconds):
+    game = dino.Game(None, seed=seed)
+    game.state = "PLAY"
+    game.reset()
+    dt, ticks, limit = dino.STEP_MS / 1000.0, 0, int(max_seconds * 1000 / dino.STEP_MS)
+    while game.state == "PLAY" and ticks < limit:
+        game.update(dt, policy(game))
+        ticks += 1
+    return int(game.distance_px / 100.0), game.elapsed, ticks, game.state != "PLAY"
+
+EPISODES = {"flower": flower_episode, "snake": snake_episode, "dino": dino_episode}
+
+# ---------------- Workers ----------------
+def setup(game, overrides):
+    # runs once per worker: tuned constants go into the game's module
+    module = importlib.import_module(MODULES[game])
+    for name, value in overrides.items():
+        setattr(module, name, value)
+
+def run_episode(game, policy, max_seconds, seed):
+    score, seconds, ticks, ended = EPISODES[game](
+        sys.modules[MODULES[game]], seed, resolve_policy(game, policy), max_seconds)
+    return {"seed": seed, "score": score, "seconds": round(seconds, 3), "ticks": ticks, "ended": ended}
+
+def spread(values):
+    out = {f"p{q}": float(np.percentile(values, q)) for q in (10, 50, 90, 99)}
+    out.update(mean=float(values.mean()), stdev=float(values.std()), min=float(values.min()), max=float(values.max()))
+    return out
+
+def parse_override(module, text):
+    name, sep, value = text.partition("=")
+    if not sep or not hasattr(module, name):
+        raise ValueError(f"{text!r}: expected NAME=VALUE for a constant in {module.__name__}")
+    try:
+        return name, ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        raise ValueError(f"{text!r}: {value!r} is not a Python literal")
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless episodes of a game over many cores")
+    parser.add_argument("game", choices=sorted(MODULES))
+    parser.add_argument("--episodes", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0, help="first seed; episode i plays seed + i")
+    parser.add_argument("--policy", help="scripted player: a built-in name or module:function "
+                                         f"({', '.join(f'{g}: {list(p)}' for g, p in POLICIES.items())})")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="override a game constant, e.g. SPAWN_EVERY_SECONDS=0.3 (repeatable)")
+    parser.add_argument("--max-seconds", type=float, default=MAX_SECONDS, help="simulated time per episode at most")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="processes; 1 runs in this one")
+    parser.add_argument("--out", help="write every episode here as a JSON line")
+    args = parser.parse_args()
+
+    module = importlib.import_module(MODULES[args.game])
+    try:
+        overrides = dict(parse_override(module, text) for text in args.set)
+        resolve_policy(args.game, args.policy)
+    except (ValueError, ImportError, AttributeError) as e:
+        parser.error(str(e))
+
+    seeds = range(args.seed, args.seed + args.episodes)
+    job = partial(run_episode, args.game, args.policy, args.max_seconds)
+    pool = None
+    if args.workers > 1:
+        pool = ProcessPoolExecutor(args.workers, initializer=setup, initargs=(args.game, overrides))
+        chunk = max(1, args.episodes // (args.workers * CHUNKS_PER_WORKER))
+        results = pool.map(job, seeds, chunksize=chunk)
+    else:
+        setup(args.game, overrides)
+        results = map(job, seeds)
+
+    out = open(args.out, "w") if args.out else None
+    scores, seconds = np.empty(args.episodes), np.empty(args.episodes)
+    ticks = cut = 0
+    t0 = last = time.perf_counter()
+    for i, r in enumerate(results):
+        scores[i], seconds[i] = r["score"], r["seconds"]
+        ticks += r["ticks"]
+        cut += not r["ended"]
+        if out is not None:
+            out.write(json.dumps(r) + "\n")
+        now = time.perf_counter()
+        if now - last >= 1.0:
+            last = now
+            print(f"  {i + 1}/{args.episodes} episodes, mean score {scores[:i + 1].mean():.1f}", flush=True)
+    elapsed = time.perf_counter() - t0
+    if pool is not None:
+        pool.shutdown()
+    if out is not None:
+        out.close()
+
+    setting = [args.policy or next(iter(POLICIES[args.game]))] + [f"{k}={v!r}" for k, v in overrides.items()]
+    print(f"{args.game}, {args.episodes} episodes ({', '.join(setting)}) on {args.workers} worker(s)")
+    print(f"  {elapsed:.2f} s: {args.episodes / elapsed:.1f} episodes/s, "
+          f"{seconds.sum() / elapsed:.0f} simulated s/s, {ticks / elapsed / 1000.0:.1f}k ticks/s")
+    if cut:
+        print(f"  {cut} episodes cut off at {args.max_seconds:.0f} s")
+    for name, values in (("score", scores), ("seconds", seconds)):
+        s = spread(values)
+        print(f"  {name:<8} mean {s['mean']:9.2f}  stdev {s['stdev']:8.2f}  min {s['min']:8.1f}  "
+              f"p10 {s['p10']:8.1f}  p50 {s['p50']:8.1f}  p90 {s['p90']:8.1f}  p99 {s['p99']:8.1f}  max {s['max']:8.1f}")
+
+if __name__ == "__main__":
+    main()
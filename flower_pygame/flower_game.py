@@ -1,8 +1,23 @@
+import argparse
 import pygame
-import random
 import sys
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np
+
+from game_common.dirty import DirtyRenderer
+from game_common.input import InputBuffer, filter_events
+from game_common.loop import FixedLoop
+from game_common.profiler import FrameProfiler
+from game_common.scores import EMPTY, ScoreStore, describe
+from game_common.screens import StaticScreen
+from game_common.sprites import COLORKEY, SpriteCache
+from game_common.text import TextCache, HudField
+
 # ---------------- Config ----------------
 WIDTH, HEIGHT = 640, 720
 FPS = 60
@@ -15,8 +30,15 @@ SPAWN_EVERY_SECONDS = 0.45  # base spawn rate (spawns get slightly faster over t
 START_TIME = 60  # seconds
 START_LIVES = 3
 
+STORM_SPAWN = 250  # flowers per spawn tick in storm mode
+DIRTY_FULL_THRESHOLD = 0.4  # fraction of the screen above which dirty mode flips
+HUD_BAR = pygame.Rect(0, 0, WIDTH, 48)
+LEFT_KEYS = {pygame.K_LEFT, pygame.K_a}
+RIGHT_KEYS = {pygame.K_RIGHT, pygame.K_d}
+
 FONT_NAME = "freesansbold.ttf"
-HIGHSCORE_FILE = Path("flower_highscore.txt")
+SCORE_GAME = "flower"
+HIGHSCORE_FILE = Path("flower_highscore.txt")  # the old one-number store, migrated once
 
 # Colors
 BG = (20, 22, 28)
@@ -28,68 +50,156 @@ GREEN = (90, 210, 140)
 BLUE = (90, 160, 250)
 PINK = (255, 170, 220)
 PURPLE = (185, 150, 255)
+FLOWER_COLORS = [YELLOW, PINK, PURPLE, BLUE, GREEN]
 
 # ---------------- Helpers ----------------
+TEXT = TextCache(FONT_NAME)
+
 def draw_text(surf, text, size, color, center):
-    font = pygame.font.Font(FONT_NAME, size)
-    ren = font.render(text, True, color)
-    rect = ren.get_rect(center=center)
-    surf.blit(ren, rect)
-
-def load_highscore():
-    try:
-        if HIGHSCORE_FILE.exists():
-            return int(HIGHSCORE_FILE.read_text().strip())
-    except Exception:
-        pass
-    return 0
-
-def save_highscore(score):
-    try:
-        HIGHSCORE_FILE.write_text(str(score))
-    except Exception:
-        pass
+    return TEXT.draw(surf, text, size, color, center)
+
+def bake_flower(size, color):
+    # Simple flower: a circle with petals
+    r = size // 2
+    petal_r = int(r * 0.9)
+    c = r + petal_r
+    surf = pygame.Surface((2 * c + 1, 2 * c + 1))
+    surf.fill(COLORKEY)
+    offsets = [(r, 0), (-r, 0), (0, r), (0, -r)]
+    for ox, oy in offsets:
+        pygame.draw.circle(surf, color, (c + ox, c + oy), petal_r)
+    pygame.draw.circle(surf, WHITE, (c, c), r)
+    return surf, (c, c)
+
+FLOWER_SPRITES = SpriteCache(bake_flower)
+
+def flower_variants():
+    # ordered so that (size - FLOWER_MIN_SIZE) * len(FLOWER_COLORS) + color_index is the position
+    return [(size, color) for size in range(FLOWER_MIN_SIZE, FLOWER_MAX_SIZE + 1) for color in FLOWER_COLORS]
 
 # ---------------- Entities ----------------
-class Flower:
-    def __init__(self):
-        self.size = random.randint(FLOWER_MIN_SIZE, FLOWER_MAX_SIZE)
-        self.x = random.uniform(self.size, WIDTH - self.size)
-        self.y = -self.size - random.uniform(0, 200)
-        self.speed = random.uniform(FLOWER_MIN_SPEED, FLOWER_MAX_SPEED)
-        self.wind = random.uniform(-0.6, 0.6)  # slight horizontal drift
-        self.color = random.choice([YELLOW, PINK, PURPLE, BLUE, GREEN])
-
-    def update(self, dt):
-        self.y += self.speed * (dt * 60)         # normalize to 60 FPS feel
-        self.x += self.wind * (dt * 60) * 0.3
+# Struct-of-arrays storage for every falling flower. Each update is a handful
+# of vectorized passes (move, bounce, catch, cull) and removal swaps the last
+# live flowers into the holes, so cost stays linear in the live count.
+class FlowerField:
+    def __init__(self, capacity=256, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.n = 0
+        self.sprites = None
+        self.last_step = 0.0  # the step of the latest update, for drawing in between
+        self.alloc(capacity)
+
+    def alloc(self, capacity):
+        old = self.n
+        fields = {
+            "x": np.float64, "y": np.float64, "speed": np.float64,
+            "wind": np.float64, "size": np.int32, "color": np.int32,
+        }
+        for name, dtype in fields.items():
+            arr = np.empty(capacity, dtype)
+            if old:
+                arr[:old] = getattr(self, name)[:old]
+            setattr(self, name, arr)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.n
+
+    def clear(self):
+        self.n = 0
+
+    def spawn(self, count):
+        if count <= 0:
+            return
+        n0, n1 = self.n, self.n + count
+        if n1 > self.capacity:
+            self.alloc(max(n1, self.capacity * 2))
+        rng = self.rng
+        size = rng.integers(FLOWER_MIN_SIZE, FLOWER_MAX_SIZE + 1, count)
+        self.size[n0:n1] = size
+        self.x[n0:n1] = rng.uniform(size, WIDTH - size)
+        self.y[n0:n1] = -size - rng.uniform(0, 200, count)
+        self.speed[n0:n1] = rng.uniform(FLOWER_MIN_SPEED, FLOWER_MAX_SPEED, count)
+        self.wind[n0:n1] = rng.uniform(-0.6, 0.6, count)  # slight horizontal drift
+        self.color[n0:n1] = rng.integers(0, len(FLOWER_COLORS), count)
+        self.n = n1
+
+    def update(self, dt, basket_rect):
+        # returns (caught, missed) counts; both are removed from the field
+        n = self.n
+        if n == 0:
+            return 0, 0
+        x, y, wind = self.x[:n], self.y[:n], self.wind[:n]
+        size = self.size[:n]
+
+        step = dt * 60                           # normalize to 60 FPS feel
+        self.last_step = step
+        y += self.speed[:n] * step
+        x += wind * step * 0.3
         # bounce a little at edges so flowers don't disappear fully
-        if self.x < self.size:
-            self.x, self.wind = self.size, abs(self.wind)
-        elif self.x > WIDTH - self.size:
-            self.x, self.wind = WIDTH - self.size, -abs(self.wind)
-
-    def draw(self, surf):
-        # Simple flower: a circle with petals
-        r = self.size // 2
-        cx, cy = int(self.x), int(self.y)
-        petal_r = int(r * 0.9)
-        offsets = [(r, 0), (-r, 0), (0, r), (0, -r)]
-        for ox, oy in offsets:
-            pygame.draw.circle(surf, self.color, (cx + ox, cy + oy), petal_r)
-        pygame.draw.circle(surf, WHITE, (cx, cy), r)
-
-    def rect(self):
-        r = self.size
-        return pygame.Rect(int(self.x - r), int(self.y - r), r * 2, r * 2)
-
-    def off_screen(self):
-        return self.y - self.size > HEIGHT + 40
+        lo = x < size
+        x[lo] = size[lo]
+        wind[lo] = np.abs(wind[lo])
+        hi = x > WIDTH - size
+        x[hi] = WIDTH - size[hi]
+        wind[hi] = -np.abs(wind[hi])
+
+        # same test as Rect(int(x - r), int(y - r), 2r, 2r).colliderect(basket)
+        bx, by, bw, bh = basket_rect
+        fx = np.trunc(x - size)
+        fy = np.trunc(y - size)
+        caught = (fx < bx + bw) & (bx < fx + 2 * size) & (fy < by + bh) & (by < fy + 2 * size)
+        missed = ~caught & (y - size > HEIGHT + 40)
+        n_caught = int(np.count_nonzero(caught))
+        n_missed = int(np.count_nonzero(missed))
+        if n_caught or n_missed:
+            self.remove(caught | missed)
+        return n_caught, n_missed
+
+    def remove(self, mask):
+        dead = np.flatnonzero(mask)
+        keep = self.n - len(dead)
+        holes = dead[dead < keep]
+        movers = np.flatnonzero(~mask[keep:]) + keep
+        for arr in (self.x, self.y, self.speed, self.wind, self.size, self.color):
+            arr[holes] = arr[movers]
+        self.n = keep
+
+    def sprite_table(self):
+        if self.sprites is None:
+            table = [FLOWER_SPRITES.get(size, color) for size, color in flower_variants()]
+            self.sprites = (
+                [sprite for sprite, _ in table],
+                np.array([anchor[0] for _, anchor in table]),
+                np.array([anchor[1] for _, anchor in table]),
+            )
+        return self.sprites
+
+    def blit_list(self, alpha=1.0):
+        n = self.n
+        size, x, y = self.size[:n], self.x[:n], self.y[:n]
+        if alpha < 1.0:
+            # back along the last step's motion (bounces just clamp)
+            back = self.last_step * (1.0 - alpha)
+            y = y - self.speed[:n] * back
+            x = np.clip(x - self.wind[:n] * back * 0.3, size, WIDTH - size)
+        visible = np.flatnonzero(y + size > 0)
+        if len(visible) == 0:
+            return []
+        surfs, ax, ay = self.sprite_table()
+        idx = (size[visible] - FLOWER_MIN_SIZE) * len(FLOWER_COLORS) + self.color[:n][visible]
+        px = np.trunc(x[visible]).astype(np.int64) - ax[idx]
+        py = np.trunc(y[visible]).astype(np.int64) - ay[idx]
+        return list(zip(map(surfs.__getitem__, idx.tolist()), zip(px.tolist(), py.tolist())))
+
+    def draw(self, surf, dirty=False, alpha=1.0):
+        return surf.blits(self.blit_list(alpha), dirty)
 
 class Basket:
     def __init__(self):
         self.w, self.h = BASKET_W, BASKET_H
         self.x = WIDTH // 2 - self.w // 2
+        self.prev_x = self.x
         self.y = HEIGHT - 80
         self.speed = 500  # keyboard move speed
 
@@ -97,72 +207,108 @@ class Basket:
     def rect(self):
         return pygame.Rect(int(self.x), int(self.y), self.w, self.h)
 
+    def rect_at(self, alpha):
+        return pygame.Rect(int(self.prev_x + (self.x - self.prev_x) * alpha), int(self.y), self.w, self.h)
+
+    def steer(self, dt, direction):
+        # direction: -1 left, 0 stay, 1 right, at keyboard speed
+        self.x = max(0, min(WIDTH - self.w, self.x + direction * self.speed * dt))
+
     def update_keyboard(self, dt, keys):
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            self.x -= self.speed * dt
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            self.x += self.speed * dt
-        self.x = max(0, min(WIDTH - self.w, self.x))
+        # keys: the set down for this step
+        self.steer(dt, bool(keys & RIGHT_KEYS) - bool(keys & LEFT_KEYS))
 
     def update_mouse(self):
         mx, _ = pygame.mouse.get_pos()
         self.x = max(0, min(WIDTH - self.w, mx - self.w // 2))
 
-    def draw(self, surf):
+    def draw(self, surf, alpha=1.0):
+        rect = self.rect_at(alpha)
         # Basket body
-        pygame.draw.rect(surf, (210, 170, 100), self.rect, border_radius=10)
+        body = pygame.draw.rect(surf, (210, 170, 100), rect, border_radius=10)
         # Rim
-        pygame.draw.rect(surf, (170, 130, 60), self.rect.inflate(0, -14).move(0, -6), border_radius=8)
+        pygame.draw.rect(surf, (170, 130, 60), rect.inflate(0, -14).move(0, -6), border_radius=8)
         # Handle
-        hx, hy = self.rect.centerx, self.rect.y
-        pygame.draw.arc(surf, (170, 130, 60), pygame.Rect(hx - 60, hy - 40, 120, 60), 3.14, 0, 3)
+        hx, hy = rect.centerx, rect.y
+        handle = pygame.draw.arc(surf, (170, 130, 60), pygame.Rect(hx - 60, hy - 40, 120, 60), 3.14, 0, 3)
+        return body.union(handle)
 
 # ---------------- Game ----------------
 class Game:
-    def __init__(self, screen):
+    def __init__(self, screen, storm=False, dirty=False, turbo=1.0, scores=None, seed=None):
         self.screen = screen
-        self.clock = pygame.time.Clock()
+        self.scores = scores  # ScoreStore for finished runs; None keeps nothing
+        self.storm = storm  # mass-spawn stress mode: misses don't cost lives
+        self.field = FlowerField(seed=seed)
+        self.background = None
+        self.renderer = None
+        if dirty:
+            self.renderer = DirtyRenderer(screen, self.get_background(), DIRTY_FULL_THRESHOLD)
+        self.loop = FixedLoop(1.0 / FPS, FPS, turbo)
+        self.loop.bind(self.handle_events, self.update, self.render, self.idle)
+        self.input = InputBuffer(LEFT_KEYS | RIGHT_KEYS)
+        self.profiler = FrameProfiler(self.loop, [
+            (self, "draw_game", "draw"), (self, "draw_game_dirty", "draw"), (self, "draw_flowers", "flowers"),
+            (Basket, "draw", "basket"), (self, "draw_hud", "hud"), (self, "draw_hud_dirty", "hud"),
+            (self.field, "update", "field"),
+        ], on_toggle=self.profiler_toggled, inputs=self.input)
         self.state = "MENU"
-        self.highscore = load_highscore()
+        self.highscore = 0
+        if scores is not None:
+            scores.track(SCORE_GAME, HIGHSCORE_FILE)
+        FLOWER_SPRITES.warm(flower_variants())
+        self.hud_score = HudField(TEXT, "Score: {}", 22, WHITE, (80, 24))
+        self.hud_time = HudField(TEXT, "Time: {}", 22, YELLOW, (WIDTH // 2, 24))
+        self.hud_lives = HudField(TEXT, "Lives: {}", 22, RED, (WIDTH - 80, 24))
+        self.menu_screen = StaticScreen(screen, self.render_menu)
+        self.game_over_screen = StaticScreen(screen, self.render_game_over)
         self.reset()
 
     def reset(self):
         self.basket = Basket()
-        self.flowers = []
+        self.field.clear()
         self.score = 0
         self.time_left = float(START_TIME)
         self.lives = START_LIVES
         self.spawn_timer = 0.0
         self.elapsed = 0.0
+        self.missed = 0
         self.paused = False
+        self.input.clear()  # presses from the menu aren't moves
         # Make early game a bit easier
-        for _ in range(5):
-            self.flowers.append(Flower())
+        self.field.spawn(5)
 
     # ---------- Input ----------
     def handle_events(self):
         for e in pygame.event.get():
             if e.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
+                pygame.event.post(e)  # for a launcher running the game
+                self.quit_game()
+                return
+            self.input.feed(e)
+            if self.profiler.handle(e):
+                continue
             if e.type == pygame.KEYDOWN:
                 if self.state == "MENU":
                     if e.key in (pygame.K_RETURN, pygame.K_SPACE):
                         self.state = "PLAY"; self.reset()
                     elif e.key == pygame.K_q:
-                        pygame.quit(); sys.exit()
+                        self.quit_game()
                 elif self.state == "PLAY":
                     if e.key in (pygame.K_p, pygame.K_PAUSE):
                         self.paused = not self.paused
+                        self.input.clear()
                 elif self.state == "GAME_OVER":
                     if e.key in (pygame.K_r, pygame.K_RETURN, pygame.K_SPACE):
                         self.state = "PLAY"; self.reset()
                     elif e.key == pygame.K_m:
                         self.state = "MENU"
                     elif e.key == pygame.K_q:
-                        pygame.quit(); sys.exit()
+                        self.quit_game()
 
     # ---------- Update ----------
-    def update(self, dt):
+    def update(self, dt, steer=None):
+        # steer: a scripted player's Basket.steer direction instead of the input devices
         if self.state != "PLAY" or self.paused:
             return
 
@@ -172,46 +318,73 @@ class Game:
         # spawn rate ramps up very slightly over time
         spawn_every = max(0.20, SPAWN_EVERY_SECONDS - min(0.20, self.elapsed * 0.01))
         self.spawn_timer += dt
+        spawns = 0
         while self.spawn_timer >= spawn_every:
-            self.flowers.append(Flower())
+            spawns += 1
             self.spawn_timer -= spawn_every
+        self.field.spawn(spawns * (STORM_SPAWN if self.storm else 1))
 
         # player control: mouse or keyboard simultaneously
-        keys = pygame.key.get_pressed()
-        if pygame.mouse.get_focused():
-            self.basket.update_mouse()
-        self.basket.update_keyboard(dt, keys)
+        self.basket.prev_x = self.basket.x
+        if steer is not None:
+            self.basket.steer(dt, steer)
+        else:
+            if pygame.mouse.get_focused():
+                self.basket.update_mouse()
+            self.basket.update_keyboard(dt, self.input.step())
 
         # update flowers and check catches/misses
-        for f in list(self.flowers):
-            f.update(dt)
-            if f.rect().colliderect(self.basket.rect):
-                self.flowers.remove(f)
-                self.score += 1
-                # tiny time reward to keep streaks alive
-                self.time_left = min(999, self.time_left + 0.25)
-            elif f.off_screen():
-                self.flowers.remove(f)
-                self.lives -= 1
+        b = self.basket
+        caught, missed = self.field.update(dt, (int(b.x), int(b.y), b.w, b.h))
+        if caught:
+            self.score += caught
+            # tiny time reward to keep streaks alive
+            self.time_left = min(999, self.time_left + 0.25 * caught)
+        self.missed += missed
+        if not self.storm:
+            self.lives -= missed
 
         # check game over
         if self.time_left <= 0 or self.lives <= 0:
             self.state = "GAME_OVER"
-            if self.score > self.highscore:
-                self.highscore = self.score
-                save_highscore(self.highscore)
+            self.highscore = max(self.highscore, self.score)
+            if self.scores is not None:
+                self.scores.add(SCORE_GAME, self.score, self.elapsed)
 
     # ---------- Draw ----------
+    def get_background(self):
+        if self.background is None:
+            bg = pygame.Surface((WIDTH, HEIGHT))
+            bg.fill(BG)
+            # ground
+            pygame.draw.rect(bg, (30, 60, 40), (0, HEIGHT - 50, WIDTH, 50))
+            # top bar
+            pygame.draw.rect(bg, (28, 30, 36), HUD_BAR)
+            if pygame.display.get_surface() is not None:
+                bg = bg.convert()
+            self.background = bg
+        return self.background
+
     def draw_hud(self):
         # Top bar
-        pygame.draw.rect(self.screen, (28, 30, 36), (0, 0, WIDTH, 48))
-        draw_text(self.screen, f"Score: {self.score}", 22, WHITE, (80, 24))
-        draw_text(self.screen, f"Time: {int(self.time_left)}", 22, YELLOW, (WIDTH // 2, 24))
-        draw_text(self.screen, f"Lives: {self.lives}", 22, RED, (WIDTH - 80, 24))
+        pygame.draw.rect(self.screen, (28, 30, 36), HUD_BAR)
+        self.hud_score.draw(self.screen, self.score)
+        self.hud_time.draw(self.screen, int(self.time_left))
+        self.hud_lives.draw(self.screen, self.lives)
         if self.paused:
             draw_text(self.screen, "PAUSED", 26, BLUE, (WIDTH // 2, 70))
 
+    def leaderboard(self):
+        # latest leaderboard; its best can be ahead of this session's
+        board = self.scores.board(SCORE_GAME) if self.scores is not None else EMPTY
+        self.highscore = max(self.highscore, board.best)
+        return board
+
     def draw_menu(self):
+        self.leaderboard()
+        self.menu_screen.draw((self.highscore,))
+
+    def render_menu(self):
         self.screen.fill(BG)
         draw_text(self.screen, "F L O W E R   P I C K E R", 44, PINK, (WIDTH // 2, HEIGHT // 3))
         draw_text(self.screen, "Catch the falling flowers with your basket.", 22, WHITE, (WIDTH // 2, HEIGHT // 3 + 60))
@@ -226,48 +399,119 @@ class Game:
             pygame.draw.circle(self.screen, (70, 150, 90), (x, y + 35), 35)
             pygame.draw.rect(self.screen, (60, 120, 70), (x - 30, y + 35, 60, 12), border_radius=6)
 
-    def draw_game(self):
-        self.screen.fill(BG)
-        # ground
-        pygame.draw.rect(self.screen, (30, 60, 40), (0, HEIGHT - 50, WIDTH, 50))
+    def draw_game(self, alpha=1.0):
+        # alpha: how far between the last two updates to draw things
+        self.screen.blit(self.get_background(), (0, 0))
         # flowers
-        for f in self.flowers:
-            f.draw(self.screen)
+        self.draw_flowers(alpha=alpha)
         # basket
-        self.basket.draw(self.screen)
+        self.basket.draw(self.screen, alpha)
         # hud
         self.draw_hud()
 
+    def draw_flowers(self, dirty=False, alpha=1.0):
+        return self.field.draw(self.screen, dirty, alpha)
+
+    def draw_game_dirty(self, alpha=1.0):
+        dr = self.renderer
+        dr.begin()
+        dr.extend(self.draw_flowers(dirty=True, alpha=alpha))
+        dr.add(self.basket.draw(self.screen, alpha))
+        self.draw_hud_dirty()
+
+    def draw_hud_dirty(self):
+        # the bar is drawn over flowers, so anything that touched it this
+        # frame or last frame gets the bar restored and the text on it redrawn;
+        # after an invalidate the whole background went back, so all of it
+        dr = self.renderer
+        touched = [r.clip(HUD_BAR) for r in dr.dirty() if r.colliderect(HUD_BAR)]
+        if dr.full:
+            touched = [HUD_BAR]
+        for r in touched:
+            dr.restore(r)
+        for hud, value in ((self.hud_score, self.score),
+                           (self.hud_time, int(self.time_left)),
+                           (self.hud_lives, self.lives)):
+            old = hud.rect
+            if hud.update(value):
+                if old is not None:
+                    dr.restore(old)
+                    dr.add(old)
+            elif hud.rect.collidelist(touched) == -1:
+                continue
+            # text is antialiased, so always blend onto a clean bar
+            dr.restore(hud.rect)
+            dr.add(hud.rect)
+            self.screen.blit(hud.surf, hud.rect)
+        if self.paused:
+            dr.add(draw_text(self.screen, "PAUSED", 26, BLUE, (WIDTH // 2, 70)))
+
     def draw_game_over(self):
+        self.game_over_screen.draw((self.score, self.leaderboard()))
+
+    def render_game_over(self):
         self.screen.fill(BG)
         draw_text(self.screen, "You Died!", 52, RED, (WIDTH // 2, HEIGHT // 3))
         draw_text(self.screen, f"Score: {self.score}", 28, WHITE, (WIDTH // 2, HEIGHT // 3 + 60))
         draw_text(self.screen, f"Best:  {self.highscore}", 22, BLUE, (WIDTH // 2, HEIGHT // 3 + 95))
         draw_text(self.screen, "R / ENTER / SPACE: Retry", 20, YELLOW, (WIDTH // 2, HEIGHT // 3 + 150))
         draw_text(self.screen, "M: Main Menu   •   Q: Quit", 18, GRAY, (WIDTH // 2, HEIGHT // 3 + 185))
+        for i, line in enumerate(describe(self.leaderboard())):
+            draw_text(self.screen, line, 18, WHITE, (WIDTH // 2, HEIGHT // 3 + 235 + 28 * i))
 
     # ---------- Main Loop ----------
-    def run(self):
-        while True:
-            dt = self.clock.tick(FPS) / 1000.0
-            self.handle_events()
-            self.update(dt)
+    def quit_game(self):
+        # back to whoever started the game: the script ends, a launcher carries on
+        self.loop.stop()
+
+    def idle(self):
+        return self.state != "PLAY" or self.paused
+
+    def render(self, alpha):
+        if self.state == "PLAY" and self.renderer is not None:
+            self.draw_game_dirty(alpha)
+            self.renderer.present()
+            self.input.presented()
+            return
 
-            if self.state == "MENU":
-                self.draw_menu()
-            elif self.state == "PLAY":
-                self.draw_game()
-            elif self.state == "GAME_OVER":
-                self.draw_game_over()
+        if self.state == "MENU":
+            self.draw_menu()
+        elif self.state == "PLAY":
+            self.draw_game(alpha)
+        elif self.state == "GAME_OVER":
+            self.draw_game_over()
 
-            pygame.display.flip()
+        if self.renderer is not None:
+            self.renderer.invalidate()
+        pygame.display.flip()
+        self.input.presented()
+
+    def profiler_toggled(self, on):
+        # the overlay was drawn over whatever the dirty renderer kept
+        if self.renderer is not None:
+            self.renderer.invalidate()
+
+    def run(self):
+        self.loop.run()
 
 # ---------------- Entrypoint ----------------
 def main():
-    pygame.init()
+    parser = argparse.ArgumentParser(description="Flower Picker")
+    parser.add_argument("--storm", action="store_true", help="spawn flowers by the hundred; misses don't cost lives")
+    parser.add_argument("--dirty", action="store_true", help="only push changed screen regions to the display")
+    parser.add_argument("--turbo", type=float, default=1.0, help="simulated seconds per real second")
+    parser.add_argument("--profile", action="store_true", help="start with the frame profiler on (F3 toggles, F4 dumps)")
+    args = parser.parse_args()
+
+    pygame.display.init()  # just what the game uses: no audio, joystick, ...
+    pygame.font.init()
+    filter_events()
     pygame.display.set_caption("Flower Picker — Start Menu & Died Screen")
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
-    Game(screen).run()
+    game = Game(screen, storm=args.storm, dirty=args.dirty, turbo=args.turbo, scores=ScoreStore())
+    if args.profile:
+        game.profiler.toggle()
+    game.run()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,75 @@
+import pygame
+
+# ---------------- Dirty-rect renderer ----------------
+# Keeps the screen surface complete at all times: every frame first restores
+# last frame's rects from the cached background, the game draws on top and
+# reports what it touched, and only the union of old + new rects is pushed to
+# the display. Falls back to a full flip when the dirty area gets too large.
+class DirtyRenderer:
+    def __init__(self, screen, background, full_threshold=0.4):
+        self.screen = screen
+        self.background = background
+        self.full_threshold = full_threshold
+        self.screen_area = screen.get_width() * screen.get_height()
+        self.prev = []
+        self.cur = []
+        self.full = True
+        self.frames = 0
+        self.full_frames = 0
+        self.pixels_pushed = 0       # last frame
+        self.total_pixels = 0
+
+    def invalidate(self):
+        self.full = True
+        self.prev = []
+
+    def set_background(self, background):
+        self.background = background
+        self.invalidate()
+
+    def begin(self):
+        if self.full:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            for r in self.prev:
+                self.screen.blit(self.background, r, r)
+        self.cur = []
+
+    def restore(self, rect):
+        self.screen.blit(self.background, rect, rect)
+
+    def add(self, rect):
+        if rect is not None and rect.w > 0 and rect.h > 0:
+            self.cur.append(rect)
+
+    def extend(self, rects):
+        for r in rects:
+            self.add(r)
+
+    def dirty(self):
+        return self.prev + self.cur
+
+    def present(self):
+        rects = self.dirty()
+        area = sum(r.w * r.h for r in rects)
+        if self.full or area > self.screen_area * self.full_threshold:
+            pygame.display.flip()
+            self.full_frames += 1
+            area = self.screen_area
+        else:
+            pygame.display.update(rects)
+        self.frames += 1
+        self.pixels_pushed = area
+        self.total_pixels += area
+        self.prev = self.cur
+        self.cur = []
+        self.full = False
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "full_frames": self.full_frames,
+            "pixels_pushed": self.pixels_pushed,
+            "avg_pixels": self.total_pixels / self.frames if self.frames else 0.0,
+            "avg_fraction": self.total_pixels / (self.frames * self.screen_area) if self.frames else 0.0,
+        }
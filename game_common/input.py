@@ -0,0 +1,77 @@
+from collections import deque
+from time import perf_counter
+
+import numpy as np
+import pygame
+
+# everything the games act on; mouse motion, window chatter and the rest
+# never reach the queue (the mouse is polled where it's used)
+GAME_EVENTS = (pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP, pygame.WINDOWFOCUSLOST)
+QUEUE_EDGES = 16  # key presses kept for the simulation at most
+LATENCY_SAMPLES = 600
+
+def filter_events(types=GAME_EVENTS):
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(list(types))
+
+# ---------------- Input buffer ----------------
+# Sits between the event queue and the fixed steps. Every press of a key
+# the simulation reads is queued with the time the loop picked it up, so a
+# tap that is over before the next step still counts and quick presses are
+# applied one step at a time in order instead of the last one winning. When
+# the frame a press was applied in is shown, the time since pickup goes into
+# a ring of input-to-display latencies.
+class InputBuffer:
+    def __init__(self, keys, capacity=LATENCY_SAMPLES):
+        self.keys = set(keys)
+        self.held = set()
+        self.edges = deque(maxlen=QUEUE_EDGES)  # (key, pickup time) not yet applied
+        self.applied = []  # pickup times of presses used since the last present
+        self.latency = np.zeros(capacity)  # ms
+        self.samples = 0
+
+    def feed(self, event):
+        if event.type == pygame.KEYDOWN and event.key in self.keys:
+            self.held.add(event.key)
+            self.edges.append((event.key, perf_counter()))
+        elif event.type == pygame.KEYUP:
+            self.held.discard(event.key)
+        elif event.type == pygame.WINDOWFOCUSLOST:
+            self.held.clear()  # the key-ups go to whichever window has focus now
+
+    def clear(self):
+        self.edges.clear()
+
+    # ---------- at a simulation step ----------
+    def step(self):
+        # the keys down for this step: held now, or pressed since the last
+        # step however briefly
+        down = set(self.held)
+        for key, t in self.edges:
+            down.add(key)
+            self.applied.append(t)
+        self.edges.clear()
+        return down
+
+    def take(self, keys):
+        # the oldest queued press of one of keys, for inputs that apply one
+        # press per step (presses of other keys ahead of it are dropped)
+        while self.edges:
+            key, t = self.edges.popleft()
+            if key in keys:
+                self.applied.append(t)
+                return key
+        return None
+
+    # ---------- after a present ----------
+    def presented(self):
+        if not self.applied:
+            return
+        now = perf_counter()
+        for t in self.applied:
+            self.latency[self.samples % len(self.latency)] = (now - t) * 1000.0
+            self.samples += 1
+        self.applied.clear()
+
+    def window(self):
+        return self.latency[:min(self.samples, len(self.latency))]
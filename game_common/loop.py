@@ -0,0 +1,73 @@
+import pygame
+
+from game_common.screens import wait_idle
+
+RENDER_FPS = 60
+MAX_CATCHUP = 5  # steps one frame may run to catch up, per unit of turbo
+
+# ---------------- Fixed-timestep loop ----------------
+# Real time (times `turbo`) fills an accumulator that the simulation drains
+# in steps of exactly `step` seconds, so what happens in a game no longer
+# depends on the frame rate. Each frame renders once with alpha, how far
+# time has got into the next step, for drawing between the last two
+# states. A frame runs at most MAX_CATCHUP * turbo steps; time past that is
+# dropped (the game slows down for a moment) instead of piling up into
+# ever longer catch-up frames.
+class FixedLoop:
+    def __init__(self, step, fps=RENDER_FPS, turbo=1.0, max_steps=MAX_CATCHUP):
+        self.step = step  # seconds per update; the game may change it between steps
+        self.fps = fps
+        self.turbo = turbo
+        self.max_steps = max_steps
+        self.clock = pygame.time.Clock()
+        self.acc = 0.0
+        self.steps = 0
+        self.dropped = 0.0  # simulated seconds given up to the catch-up cap
+        self.running = False
+
+    def alpha(self):
+        return min(1.0, self.acc / self.step)
+
+    def bind(self, handle_events, update, render, idle):
+        # update(dt) is one fixed step, render(alpha) one frame; while idle()
+        # holds the loop sleeps until there's input and sim time stands
+        # still. Kept as attributes so a profiler can wrap them.
+        self.on_events = handle_events
+        self.on_update = update
+        self.on_render = render
+        self.is_idle = idle
+
+    def advance(self, frame_s):
+        # run the steps frame_s seconds of real time pay for; returns how many
+        self.acc += frame_s * self.turbo
+        cap = max(1, int(self.max_steps * self.turbo))
+        n = 0
+        while self.acc >= self.step and not self.is_idle():
+            if n == cap:
+                self.dropped += self.acc - self.acc % self.step
+                self.acc %= self.step
+                break
+            self.on_update(self.step)
+            self.acc -= self.step
+            n += 1
+        self.steps += n
+        return n
+
+    def stop(self):
+        # run() returns after the current frame's events
+        self.running = False
+
+    def run(self):
+        # the first frame renders straight away; an idle wait comes after it
+        self.running = True
+        while True:
+            frame_s = self.clock.tick(self.fps) / 1000.0
+            self.on_events()
+            if not self.running:
+                return
+            if not self.is_idle():
+                self.advance(frame_s)
+            self.on_render(self.alpha())
+            if self.is_idle():
+                wait_idle(self.clock)
+                self.acc = 0.0
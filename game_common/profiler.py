@@ -0,0 +1,209 @@
+import json
+import time
+from time import perf_counter
+
+import numpy as np
+import pygame
+
+PROFILE_FRAMES = 600  # frames kept, 10 s at 60 fps
+PANEL_EVERY = 15  # frames between overlay refreshes
+PANEL_W = 280
+BAR_BUDGET_MS = 1000.0 / 60  # full bar width
+TOGGLE_KEY = pygame.K_F3
+DUMP_KEY = pygame.K_F4
+PANEL_BG = (16, 16, 20)
+PANEL_TEXT = (220, 220, 220)
+PHASE_COLORS = [(90, 160, 250), (90, 210, 140), (250, 208, 60), (235, 84, 84), (185, 150, 255),
+                (255, 170, 220), (120, 220, 220), (240, 150, 80), (170, 170, 170)]
+OTHER_COLOR = (70, 70, 80)
+
+# ---------------- Frame profiler ----------------
+# Times named phases of every frame by swapping timing wrappers in for the
+# hooked callables (the loop's callbacks, draw methods, display.flip/update)
+# while it is on; switched off, the originals are put back and nothing is
+# left in the path. Nested phases count exclusive time, so phases add up to
+# the frame's work and "other" is what's left of the frame (mostly waiting
+# for the next one). Frames go into a fixed numpy ring written from the one
+# game thread: no locks, no allocation per frame.
+class FrameProfiler:
+    def __init__(self, loop, hooks=(), capacity=PROFILE_FRAMES, on_toggle=None, inputs=None):
+        # hooks: (object, attribute, phase); several may share a phase.
+        # inputs: the game's InputBuffer, to show its input-to-display latency
+        self.loop = loop
+        self.inputs = inputs
+        self.hooks = [(loop, "on_events", "events"), (loop, "on_update", "update")]
+        self.hooks += list(hooks)
+        self.hooks += [(pygame.display, "flip", "present"), (pygame.display, "update", "present")]
+        self.phases = list(dict.fromkeys(phase for _, _, phase in self.hooks)) + ["render"]
+        self.index = {phase: i for i, phase in enumerate(self.phases)}
+        self.ring = np.zeros((capacity, len(self.phases) + 1))  # phases, then the whole frame
+        self.capacity = capacity
+        self.frames = 0
+        self.current = [0.0] * len(self.phases)
+        self.child = 0.0
+        self.last_end = None
+        self.saved = []
+        self.enabled = False
+        self.on_toggle = on_toggle
+        self.panel = None
+        self.panel_at = 0  # frame count when the panel was last rendered
+        self.font = None
+
+    # ---------- switching ----------
+    def toggle(self):
+        if self.enabled:
+            for target, attr, had, original in reversed(self.saved):
+                if had:
+                    setattr(target, attr, original)
+                else:
+                    delattr(target, attr)
+            self.saved = []
+        else:
+            for target, attr, phase in self.hooks + [(self.loop, "on_render", "render")]:
+                had = attr in vars(target)
+                self.saved.append((target, attr, had, vars(target).get(attr)))
+                setattr(target, attr, self.timed(getattr(target, attr), phase, attr))
+            self.last_end = None
+            self.panel = None
+        self.enabled = not self.enabled
+        if self.on_toggle is not None:
+            self.on_toggle(self.enabled)
+
+    def handle(self, event):
+        # True when the key was the profiler's
+        if event.type != pygame.KEYDOWN:
+            return False
+        if event.key == TOGGLE_KEY:
+            self.toggle()
+            return True
+        if event.key == DUMP_KEY:
+            self.dump()
+            return True
+        return False
+
+    # ---------- recording ----------
+    def timed(self, fn, phase, attr):
+        col = self.index[phase]
+
+        def wrapper(*args, **kwargs):
+            if phase == "present":
+                # the overlay goes on just before the frame is shown
+                rect = self.draw_panel()
+                if attr == "update" and args and args[0]:
+                    args = (list(args[0]) + [rect],) + args[1:]
+            outer, self.child = self.child, 0.0
+            t0 = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                spent = perf_counter() - t0
+                self.current[col] += spent - self.child
+                self.child = outer + spent
+                if attr == "on_render":
+                    self.end_frame()
+        return wrapper
+
+    def end_frame(self):
+        now = perf_counter()
+        if self.last_end is not None:
+            row = self.ring[self.frames % self.capacity]
+            row[:-1] = self.current
+            row[-1] = now - self.last_end
+            self.frames += 1
+        self.last_end = now
+        self.current = [0.0] * len(self.phases)
+        self.child = 0.0
+
+    def window(self):
+        # captured frames, oldest first, in ms
+        n = min(self.frames, self.capacity)
+        start = self.frames % self.capacity if self.frames > self.capacity else 0
+        return np.roll(self.ring, -start, axis=0)[:n] * 1000.0
+
+    def summary(self):
+        w = self.window()
+        if len(w) == 0:
+            return None
+        frame, work = w[:, -1], w[:, :-1].sum(axis=1)
+        out = {
+            "frames": len(w),
+            "frame_ms": spread(frame),
+            "work_ms": spread(work),
+            "phase_ms": {p: float(w[:, i].mean()) for i, p in enumerate(self.phases)},
+            "other_ms": float((frame - work).mean()),
+        }
+        if self.inputs is not None and self.inputs.samples:
+            out["input_ms"] = spread(self.inputs.window())
+        return out
+
+    # ---------- overlay ----------
+    def draw_panel(self):
+        screen = pygame.display.get_surface()
+        if self.panel is None or self.frames - self.panel_at >= PANEL_EVERY:
+            self.panel = self.render_panel()
+            self.panel_at = self.frames
+        rect = self.panel.get_rect(bottomright=(screen.get_width() - 8, screen.get_height() - 8))
+        screen.blit(self.panel, rect)
+        return rect
+
+    def render_panel(self):
+        if self.font is None:
+            self.font = pygame.font.Font(None, 18)
+        s = self.summary()
+        lines = ["profiling... (F3 off, F4 dump)", ""]
+        if s is not None:
+            lines = [
+                "frame ms  p50 {p50:5.2f}  p95 {p95:5.2f}  p99 {p99:5.2f}".format(**s["frame_ms"]),
+                "work  ms  p50 {p50:5.2f}  p95 {p95:5.2f}  p99 {p99:5.2f}".format(**s["work_ms"]),
+            ]
+        if self.inputs is not None:
+            # key press picked up -> the frame that applied it shown
+            if s is not None and "input_ms" in s:
+                lines.append("input ms  p50 {p50:5.2f}  p95 {p95:5.2f}  p99 {p99:5.2f}".format(**s["input_ms"]))
+            else:
+                lines.append("input ms  (no presses yet)")
+        # same size every time, so a new panel covers the old one exactly
+        line_h = self.font.get_linesize()
+        panel = pygame.Surface((PANEL_W, 8 + line_h * (len(lines) + len(self.phases)) + 18))
+        panel.fill(PANEL_BG)
+        y = 4
+        for text in lines:
+            panel.blit(self.font.render(text, True, PANEL_TEXT), (6, y))
+            y += line_h
+        if s is not None:
+            # stacked bar of mean exclusive time per phase against a 60 fps frame
+            x, scale = 6, (PANEL_W - 12) / BAR_BUDGET_MS
+            for i, p in enumerate(self.phases):
+                w = s["phase_ms"][p] * scale
+                pygame.draw.rect(panel, PHASE_COLORS[i % len(PHASE_COLORS)], (int(x), y + 2, max(1, round(w)), 10))
+                x += w
+            other = min(max(0.0, s["other_ms"]) * scale, PANEL_W - 6 - x)
+            if other >= 1:
+                pygame.draw.rect(panel, OTHER_COLOR, (int(x), y + 2, int(other), 10))
+            y += 18
+            for i, (p, ms) in enumerate(s["phase_ms"].items()):
+                pygame.draw.rect(panel, PHASE_COLORS[i % len(PHASE_COLORS)], (6, y + 3, 10, 10))
+                panel.blit(self.font.render(f"{p:<12} {ms:6.3f} ms", True, PANEL_TEXT), (22, y))
+                y += line_h
+        return panel
+
+    # ---------- export ----------
+    def dump(self, stem=None):
+        # the captured window as <stem>.csv (one row per frame) and
+        # <stem>.json (summary plus the same rows); returns both paths
+        stem = stem or time.strftime("profile-%Y%m%d-%H%M%S")
+        w = self.window()
+        columns = self.phases + ["frame"]
+        csv_path, json_path = f"{stem}.csv", f"{stem}.json"
+        with open(csv_path, "w") as f:
+            f.write(",".join(f"{c}_ms" for c in columns) + "\n")
+            for row in w:
+                f.write(",".join(f"{v:.4f}" for v in row) + "\n")
+        with open(json_path, "w") as f:
+            json.dump({"columns": columns, "summary": self.summary(), "frames_ms": w.round(4).tolist()}, f)
+        return csv_path, json_path
+
+def spread(ms):
+    out = {f"p{q}": float(np.percentile(ms, q)) for q in (50, 95, 99)}
+    out["mean"] = float(ms.mean())
+    return out
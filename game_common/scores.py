@@ -0,0 +1,240 @@
+import argparse
+import atexit
+import itertools
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+DB_FILE = Path("scores.db")
+TOP_N = 5
+BATCH_MAX = 64  # writes committed in one transaction at most
+BUSY_MS = 2000  # another game process holding the write lock
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    game TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    duration REAL,
+    seed INTEGER,
+    at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_score ON runs (game, score);
+CREATE TABLE IF NOT EXISTS migrated (
+    game TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    at REAL NOT NULL
+);
+"""
+
+def connect(path):
+    db = sqlite3.connect(str(path), timeout=BUSY_MS / 1000.0)
+    # WAL: a crash mid-write leaves the last committed state, and readers
+    # (another game, the CLI below) never wait on the writer
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.executescript(SCHEMA)
+    return db
+
+# ---------------- Leaderboard snapshot ----------------
+# What a menu or game-over screen shows for one game. Built by the writer
+# after every batch and swapped in whole, so the game thread only ever
+# reads a finished one; a new snapshot is a new object, which makes it a
+# good StaticScreen key.
+class Board:
+    def __init__(self, runs=0, top=(), median=None, p90=None, last=None):
+        self.runs = runs
+        self.top = list(top)  # best scores, highest first
+        self.median = median
+        self.p90 = p90
+        self.last = last  # (score, fraction of runs it beat) for this process's latest run
+
+    @property
+    def best(self):
+        return self.top[0] if self.top else 0
+
+EMPTY = Board()
+
+# ---------------- Queries ----------------
+# All ride the (game, score) index: counts and offsets are range scans,
+# top-N reads the index backwards.
+def top(db, game, n=TOP_N):
+    rows = db.execute("SELECT score FROM runs WHERE game = ? ORDER BY score DESC LIMIT ?", (game, n))
+    return [score for score, in rows]
+
+def count(db, game, below=None):
+    if below is None:
+        return db.execute("SELECT COUNT(*) FROM runs WHERE game = ?", (game,)).fetchone()[0]
+    return db.execute("SELECT COUNT(*) FROM runs WHERE game = ? AND score < ?", (game, below)).fetchone()[0]
+
+def score_at(db, game, q, runs=None):
+    # the score at percentile q (0..1), nearest rank
+    runs = count(db, game) if runs is None else runs
+    if not runs:
+        return None
+    row = db.execute("SELECT score FROM runs WHERE game = ? ORDER BY score LIMIT 1 OFFSET ?",
+                     (game, min(runs - 1, int(q * runs)))).fetchone()
+    return row[0]
+
+def read_board(db, game, last=None):
+    runs = count(db, game)
+    if last is not None:
+        last = (last, count(db, game, below=last) / runs)
+    return Board(runs, top(db, game), score_at(db, game, 0.5, runs), score_at(db, game, 0.9, runs), last)
+
+# ---------------- Store ----------------
+# Every run that ends goes into scores.db. The game thread only puts jobs
+# on a queue; one writer thread owns the connection, commits whatever has
+# piled up as one transaction and then publishes fresh Boards. Game over
+# costs a queue put, never a disk write. If the database can't be opened
+# the writer still serves boards from memory, like the old highscore files
+# failing quietly.
+class ScoreStore:
+    def __init__(self, path=DB_FILE):
+        self.path = Path(path)
+        self.jobs = queue.Queue()
+        self.boards = {}
+        self.runs = itertools.count(1)
+        self.thread = threading.Thread(target=self.serve, name="scores", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    # ---------- game thread ----------
+    def track(self, game, legacy=None):
+        # keep game's board published; legacy: its old one-number highscore
+        # file, folded in as a run the first time the game is seen
+        self.jobs.put(("track", game, legacy))
+
+    def new_run(self):
+        # a key for add(): a run that can end more than once (rewound into
+        # and played on) is kept as one row, holding its latest ending
+        return next(self.runs)
+
+    def add(self, game, score, duration=None, seed=None, run=None):
+        self.jobs.put(("add", game, int(score), duration, seed, time.time(), run))
+
+    def board(self, game):
+        return self.boards.get(game, EMPTY)
+
+    def flush(self, timeout=None):
+        # wait for everything queued so far to be written
+        done = threading.Event()
+        self.jobs.put(("sync", done))
+        return done.wait(timeout)
+
+    def close(self):
+        if self.thread.is_alive():
+            self.jobs.put(None)
+            self.thread.join()
+
+    # ---------- writer thread ----------
+    def serve(self):
+        try:
+            db = connect(self.path)
+        except sqlite3.Error:
+            db = None
+        memory = {}  # game -> scores, only when there is no database
+        rows = {}  # run key -> its row id, or its index in memory[game]
+        while True:
+            batch = [self.jobs.get()]
+            while len(batch) < BATCH_MAX:
+                try:
+                    batch.append(self.jobs.get_nowait())
+                except queue.Empty:
+                    break
+            touched, last, synced, stop = set(), {}, [], False
+            try:
+                with db or nullcontext():
+                    for job in batch:
+                        if job is None:
+                            stop = True
+                        elif job[0] == "sync":
+                            synced.append(job[1])
+                        elif job[0] == "track":
+                            touched.add(job[1])
+                            if db is not None:
+                                migrate(db, job[1], job[2])
+                        else:
+                            _, game, score, duration, seed, at, run = job
+                            touched.add(game)
+                            last[game] = score
+                            row = rows.get(run)
+                            if db is not None and row is not None:
+                                db.execute("UPDATE runs SET score = ?, duration = ?, at = ? WHERE id = ?",
+                                           (score, duration, at, row))
+                            elif db is not None:
+                                row = db.execute("INSERT INTO runs (game, score, duration, seed, at) VALUES (?, ?, ?, ?, ?)",
+                                                 (game, score, duration, seed, at)).lastrowid
+                            elif row is not None:
+                                memory[game][row] = score
+                            else:
+                                scores = memory.setdefault(game, [])
+                                row = len(scores)
+                                scores.append(score)
+                            if run is not None:
+                                rows[run] = row
+                for game in touched:
+                    if db is not None:
+                        self.boards[game] = read_board(db, game, last.get(game))
+                    else:
+                        self.boards[game] = memory_board(memory.get(game, []), last.get(game))
+            except sqlite3.Error:
+                pass  # this batch is lost; the game carries on with the boards it has
+            for done in synced:
+                done.set()
+            if stop:
+                if db is not None:
+                    db.close()
+                return
+
+def migrate(db, game, legacy):
+    if db.execute("SELECT 1 FROM migrated WHERE game = ?", (game,)).fetchone():
+        return
+    source = ""
+    try:
+        path = Path(legacy)
+        score = int(float(path.read_text().strip()))
+        db.execute("INSERT INTO runs (game, score, at) VALUES (?, ?, ?)", (game, score, path.stat().st_mtime))
+        source = str(path)
+    except (TypeError, OSError, ValueError):
+        pass  # no old file, or nothing usable in it
+    db.execute("INSERT INTO migrated (game, source, at) VALUES (?, ?, ?)", (game, source, time.time()))
+
+def memory_board(scores, last):
+    ordered = sorted(scores)
+    if not ordered:
+        return EMPTY
+    n = len(ordered)
+    if last is not None:
+        last = (last, sum(s < last for s in ordered) / n)
+    return Board(n, ordered[::-1][:TOP_N], ordered[min(n - 1, n // 2)], ordered[min(n - 1, int(0.9 * n))], last)
+
+def describe(board, unit=""):
+    # the leaderboard lines the game-over screens show
+    if not board.runs:
+        return []
+    lines = ["Top: " + "   ".join(f"{s}{unit}" for s in board.top)]
+    if board.last is not None:
+        lines.append(f"Last run beat {int(board.last[1] * 100)}% of {board.runs} runs")
+    return lines
+
+def main():
+    parser = argparse.ArgumentParser(description="Leaderboards from the shared score store")
+    parser.add_argument("games", nargs="*", help="games to show (default: all)")
+    parser.add_argument("--db", default=str(DB_FILE))
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    db = connect(args.db)
+    games = args.games or [g for g, in db.execute("SELECT DISTINCT game FROM runs ORDER BY game")]
+    for game in games:
+        runs = count(db, game)
+        print(f"{game}: {runs} runs, median {score_at(db, game, 0.5, runs)}, p90 {score_at(db, game, 0.9, runs)}")
+        for i, score in enumerate(top(db, game, args.top), 1):
+            print(f"  {i:>3}. {score}")
+
+if __name__ == "__main__":
+    main()
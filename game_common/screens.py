@@ -0,0 +1,40 @@
+import pygame
+
+IDLE_WAIT_MS = 250  # longest a menu/paused loop sleeps between wakeups
+
+# ---------------- Static screens ----------------
+# Menu / game-over style screens only change when their inputs do. The first
+# draw renders straight to the screen and keeps a copy; later draws with the
+# same key are a single blit.
+class StaticScreen:
+    def __init__(self, screen, render):
+        self.screen = screen
+        self.render = render
+        self.surf = None
+        self.key = None
+        self.renders = 0
+        self.reuses = 0
+
+    def invalidate(self):
+        self.surf = None
+
+    def draw(self, key=()):
+        if self.surf is not None and key == self.key:
+            self.screen.blit(self.surf, (0, 0))
+            self.reuses += 1
+            return False
+        self.render()
+        self.surf = self.screen.copy()
+        self.key = key
+        self.renders += 1
+        return True
+
+# ---------------- Idle throttling ----------------
+def wait_idle(clock, timeout=IDLE_WAIT_MS):
+    # block until something happens (or the timeout passes), then hand the
+    # event back to the normal handler and restart the clock so the next
+    # frame doesn't see the whole wait as its dt
+    e = pygame.event.wait(timeout)
+    if e.type != pygame.NOEVENT:
+        pygame.event.post(e)
+    clock.tick()
@@ -0,0 +1,36 @@
+import pygame
+
+COLORKEY = (255, 0, 255)
+
+# ---------------- Sprite cache ----------------
+# Bakes procedurally drawn shapes once per variant. `bake(*key)` returns a
+# surface filled with COLORKEY where transparent plus the anchor point
+# (the pixel that corresponds to the entity position).
+class SpriteCache:
+    def __init__(self, bake):
+        self.bake = bake
+        self.sprites = {}
+        self.bakes = 0
+
+    def get(self, *key):
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            surf, anchor = self.bake(*key)
+            sprite = self.sprites[key] = (prepare(surf), anchor)
+            self.bakes += 1
+        return sprite
+
+    def warm(self, keys):
+        for key in keys:
+            self.get(*key)
+
+    def clear(self):
+        self.sprites.clear()
+
+def prepare(surf):
+    # convert to the display format when there is one so blits skip the
+    # per-pixel format conversion
+    if pygame.display.get_surface() is not None:
+        surf = surf.convert()
+    surf.set_colorkey(COLORKEY, pygame.RLEACCEL)
+    return surf
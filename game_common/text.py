@@ -0,0 +1,127 @@
+import time
+from collections import OrderedDict
+
+import pygame
+
+# ---------------- Text cache ----------------
+# Fonts are loaded once per size, rendered strings are kept in a small LRU
+# keyed on (text, size, color). Counters estimate how much work the cache
+# saved compared to building a Font and rendering on every call.
+class TextCache:
+    def __init__(self, font_name, max_surfaces=256):
+        self.font_name = font_name
+        self.max_surfaces = max_surfaces
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.font_loads = 0
+        self.miss_font_loads = 0  # of those, loaded by a miss
+        self.font_time = 0.0     # seconds spent constructing Fonts
+        self.render_time = 0.0   # seconds spent rasterizing on misses
+        self.bypass_renders = 0  # rasterize() calls from outside the LRU (HudField)
+        self.bypass_time = 0.0
+
+    def font(self, size):
+        font = self.fonts.get(size)
+        if font is None:
+            t0 = time.perf_counter()
+            font = pygame.font.Font(self.font_name, size)
+            self.font_time += time.perf_counter() - t0
+            self.font_loads += 1
+            self.fonts[size] = font
+        return font
+
+    def raster(self, text, size, color):
+        # -> (surface, seconds spent rendering it)
+        font = self.font(size)
+        t0 = time.perf_counter()
+        ren = font.render(text, True, color)
+        return ren, time.perf_counter() - t0
+
+    def rasterize(self, text, size, color):
+        # for callers keeping the surface themselves; counted apart from the
+        # LRU so its averages only cover lookups
+        ren, spent = self.raster(text, size, color)
+        self.bypass_renders += 1
+        self.bypass_time += spent
+        return ren
+
+    def render(self, text, size, color):
+        key = (text, size, color)
+        ren = self.surfaces.get(key)
+        if ren is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return ren
+        self.misses += 1
+        if size not in self.fonts:
+            self.miss_font_loads += 1
+        ren, spent = self.raster(text, size, color)
+        self.render_time += spent
+        self.surfaces[key] = ren
+        if len(self.surfaces) > self.max_surfaces:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+        return ren
+
+    def draw(self, surf, text, size, color, center):
+        ren = self.render(text, size, color)
+        rect = ren.get_rect(center=center)
+        surf.blit(ren, rect)
+        return rect
+
+    def clear(self):
+        self.fonts.clear()
+        self.surfaces.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        avg_font = self.font_time / self.font_loads if self.font_loads else 0.0
+        avg_render = self.render_time / self.misses if self.misses else 0.0
+        # every hit skipped a Font construction and a render; every miss
+        # after the first one per size still skipped the Font construction
+        saved = self.hits * (avg_font + avg_render) + (self.misses - self.miss_font_loads) * avg_font
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "cached_surfaces": len(self.surfaces),
+            "fonts": len(self.fonts),
+            "bypass_renders": self.bypass_renders,
+            "saved_ms": max(0.0, saved) * 1000.0,
+        }
+
+# ---------------- HUD widgets ----------------
+# A single HUD readout ("Score: 12"). The string is only re-rendered when the
+# value changes; ever-changing values bypass the LRU so they don't evict menu
+# text.
+class HudField:
+    def __init__(self, cache, fmt, size, color, center):
+        self.cache = cache
+        self.fmt = fmt
+        self.size = size
+        self.color = color
+        self.center = center
+        self.value = None
+        self.surf = None
+        self.rect = None
+        self.renders = 0
+        self.reuses = 0
+
+    def update(self, value):
+        if self.surf is not None and value == self.value:
+            self.reuses += 1
+            return False
+        self.value = value
+        self.surf = self.cache.rasterize(self.fmt.format(value), self.size, self.color)
+        self.rect = self.surf.get_rect(center=self.center)
+        self.renders += 1
+        return True
+
+    def draw(self, surf, value):
+        changed = self.update(value)
+        surf.blit(self.surf, self.rect)
+        return changed
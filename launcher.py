@@ -0,0 +1,157 @@
+import argparse
+import importlib
+import sys
+from time import perf_counter
+
+import pygame
+
+from game_common.input import filter_events
+from game_common.scores import ScoreStore
+from game_common.text import TextCache
+
+WIDTH, HEIGHT = 640, 480
+FONT_NAME = "freesansbold.ttf"
+
+BG = (20, 22, 28)
+WHITE = (240, 240, 240)
+GRAY = (120, 126, 136)
+YELLOW = (250, 208, 60)
+GREEN = (90, 210, 140)
+
+# title, module, game class; picked with 1-3 or the arrows
+GAMES = [
+    ("Flower Picker", "flower_pygame.flower_game", "Game"),
+    ("Snake", "snaketail_pygame.snake_game", "SnakeGame"),
+    ("T-Rex Desert Run", "dino_pygame.dino", "Game"),
+]
+
+TEXT = TextCache(FONT_NAME)
+
+def draw_text(surf, text, size, color, center):
+    return TEXT.draw(surf, text, size, color, center)
+
+# ---------------- Launcher ----------------
+# All three games in one process and one window. Nothing but the display
+# and fonts is initialized, and a game's module is imported and its Game
+# built only when needed: when it is picked, or earlier while the launcher
+# menu sits idle. The Game is kept afterwards, so switching to it is a
+# window resize and a state change. Every launch is timed from the pick to
+# the game's first frame on screen.
+class Launcher:
+    def __init__(self, screen):
+        self.screen = screen
+        self.scores = ScoreStore()  # one writer thread for all the games
+        self.games = {}  # index -> its game
+        self.timings = {}  # index -> first frame ms of the latest launch
+        self.selected = 0
+        self.cycling = False  # --cycle: leave each game right after its first frame
+
+    def prepare(self, index):
+        # import and build a game, if that hasn't happened yet
+        if index in self.games:
+            return self.games[index]
+        title, module, cls = GAMES[index]
+        t0 = perf_counter()
+        mod = importlib.import_module(module)
+        t1 = perf_counter()
+        game = self.games[index] = getattr(mod, cls)(self.screen, scores=self.scores)
+        t2 = perf_counter()
+        print(f"{title}: import {(t1 - t0) * 1000.0:.1f} ms, setup {(t2 - t1) * 1000.0:.1f} ms", flush=True)
+        return game
+
+    def launch(self, index):
+        title, module, _ = GAMES[index]
+        t0 = perf_counter()
+        game = self.prepare(index)
+        mod = sys.modules[module]
+        # set_mode on a live window resizes it; the display surface every
+        # game holds stays the same object
+        pygame.display.set_mode((mod.WIDTH, mod.HEIGHT))
+        pygame.display.set_caption(title)
+        game.state = "MENU"
+
+        render = game.loop.on_render
+
+        def first_frame(alpha):
+            render(alpha)
+            game.loop.on_render = render
+            self.timings[index] = (perf_counter() - t0) * 1000.0
+            print(f"{title}: first frame {self.timings[index]:.1f} ms", flush=True)
+            if self.cycling:
+                game.quit_game()
+
+        game.loop.on_render = first_frame
+        game.run()
+        if game.profiler.enabled:
+            game.profiler.toggle()  # its wrappers sit on pygame.display too
+        pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("Arcade")
+
+    def draw(self):
+        self.screen.fill(BG)
+        draw_text(self.screen, "A R C A D E", 48, YELLOW, (WIDTH // 2, 80))
+        for i, (title, _, _) in enumerate(GAMES):
+            y = 170 + 70 * i
+            color = WHITE if i == self.selected else GRAY
+            draw_text(self.screen, f"{i + 1}   {title}", 28, color, (WIDTH // 2, y))
+            if i in self.timings:
+                draw_text(self.screen, f"first frame {self.timings[i]:.0f} ms", 16, GREEN, (WIDTH // 2, y + 26))
+        draw_text(self.screen, "1-3 / ENTER to play  •  Q in a game's menu comes back here  •  ESC to quit",
+                  16, GRAY, (WIDTH // 2, HEIGHT - 30))
+        pygame.display.flip()
+
+    def run(self):
+        # a menu: nothing moves, so it only redraws when something happens;
+        # idle time before that goes into getting the next game ready
+        self.draw()
+        while True:
+            waiting = [i for i in range(len(GAMES)) if i not in self.games]
+            e = pygame.event.poll() if waiting else pygame.event.wait()
+            if e.type == pygame.NOEVENT:
+                self.prepare(waiting[0])
+                continue
+            if e.type == pygame.QUIT:
+                return
+            if e.type != pygame.KEYDOWN:
+                continue
+            if e.key in (pygame.K_ESCAPE, pygame.K_q):
+                return
+            if e.key in (pygame.K_UP, pygame.K_w):
+                self.selected = (self.selected - 1) % len(GAMES)
+            elif e.key in (pygame.K_DOWN, pygame.K_s):
+                self.selected = (self.selected + 1) % len(GAMES)
+            elif e.key in (pygame.K_RETURN, pygame.K_SPACE):
+                self.launch(self.selected)
+            elif pygame.K_1 <= e.key < pygame.K_1 + len(GAMES):
+                self.selected = e.key - pygame.K_1
+                self.launch(self.selected)
+            self.draw()
+
+    def cycle(self, rounds):
+        # every game in turn, `rounds` times: the first round is a cold
+        # start, the rest are switches back to a game already set up
+        self.cycling = True
+        for _ in range(rounds):
+            for i in range(len(GAMES)):
+                self.launch(i)
+
+def main():
+    parser = argparse.ArgumentParser(description="All three games in one window")
+    parser.add_argument("--cycle", type=int, metavar="N",
+                        help="launch every game N times, leaving each after its first frame, and exit")
+    args = parser.parse_args()
+
+    pygame.display.init()
+    pygame.font.init()
+    filter_events()
+    pygame.display.set_caption("Arcade")
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    launcher = Launcher(screen)
+    if args.cycle:
+        launcher.cycle(args.cycle)
+    else:
+        launcher.run()
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+import heapq
+import time
+from array import array
+from collections import deque
+
+import numpy as np
+
+# Works on anything shaped like SnakeGame: int cells (y * w + x), a deque
+# body with the head at [0], an `occupied` bytearray and `food` (None when
+# the board is cleared). Deliberately doesn't import snake_game so the game
+# can import it.
+
+DIRS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+CHUNK = 8  # search expansions between deadline checks
+SLACK = 0.85  # share of the budget the search may use, checks only happen every CHUNK steps
+
+def cycle_rank(w, h):
+    # position of every cell along a Hamiltonian cycle through the board
+    # (ignoring the wrap), or None when both sides are odd and there is none
+    if w % 2 and h % 2:
+        return None
+    transpose = h % 2 == 1  # snake through columns instead of rows
+    if transpose:
+        w, h = h, w
+    y, x = np.divmod(np.arange(w * h), w)
+    # rows snake through columns 1..w-1, column 0 leads back up
+    along = np.where(y % 2 == 0, x - 1, w - 1 - x)
+    rank = np.where(x > 0, y * (w - 1) + along, h * (w - 1) + (h - 1 - y))
+    if transpose:
+        rank = rank.reshape(h, w).T.reshape(-1)
+    return array("i", rank.astype(np.int32).tobytes())
+
+class Autopilot:
+    # Finds routes with an A* search *from the food* towards the head and
+    # keeps the search tree between ticks: while the food stays put the tree
+    # only needs to grow, so a search that runs out of budget simply goes on
+    # next tick.
+    #
+    # Safety comes from the Hamiltonian cycle: as long as the body lies in
+    # cycle order, the stretch of the cycle from the head round to the tail
+    # is free, so walking the cycle always reaches the tail. A move - route
+    # step or shortcut - is only taken if it lands inside that free stretch
+    # (and not past the food), which keeps the order. That check is O(1),
+    # so the budget only ever limits how good the route is, never whether
+    # the snake survives.
+    def __init__(self, w, h, budget_ms=2.0, history=600):
+        self.w, self.h = w, h
+        self.size = w * h
+        self.budget = budget_ms / 1000.0
+        self.rank = cycle_rank(w, h)
+        self.ordered = False
+        self.expect = None  # where the last move should have put the head
+        self.target = None
+        self.g = {}
+        self.parent = {}
+        self.open = []
+        self.trusted = None  # next cell of the route being followed, known clear
+        self.stale = False
+        self.times = deque(maxlen=history)
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.ticks = 0
+        self.routed = 0
+        self.fallbacks = 0
+        self.overruns = 0
+
+    def neighbors(self, cell):
+        w, h = self.w, self.h
+        y, x = divmod(cell, w)
+        return (y * w + (x + 1) % w, ((y + 1) % h) * w + x,
+                y * w + (x - 1) % w, ((y - 1) % h) * w + x)
+
+    def distance(self, a, b):
+        ay, ax = divmod(a, self.w)
+        by, bx = divmod(b, self.w)
+        dx, dy = abs(ax - bx), abs(ay - by)
+        return min(dx, self.w - dx) + min(dy, self.h - dy)
+
+    def ahead(self, a, b):
+        # cycle steps from a forward to b
+        return (self.rank[b] - self.rank[a]) % self.size
+
+    # ---------- entry point ----------
+    def choose(self, game):
+        t0 = time.perf_counter()
+        d = self.plan(game, t0 + self.budget * SLACK)
+        self.expect = self.neighbors(game.snake[0])[DIRS.index(d)]
+        spent = time.perf_counter() - t0
+        self.times.append(spent)
+        self.total_time += spent
+        self.max_time = max(self.max_time, spent)
+        self.ticks += 1
+        if spent > self.budget:
+            self.overruns += 1
+        return d
+
+    def plan(self, game, deadline):
+        head = game.snake[0]
+        nbrs = self.neighbors(head)
+        if game.food != self.target:
+            self.start_search(game.food)
+        if head != self.expect:
+            self.ordered = False  # a new round, or someone else was steering
+        if self.rank is not None and not self.ordered:
+            # wait for the body to line up with the cycle
+            self.ordered = self.in_order(game.snake)
+
+        if game.food is not None and self.search(game, nbrs, deadline):
+            self.stale = False
+            for step in self.route(game, nbrs):
+                if self.safe(game, head, step):
+                    self.routed += 1
+                    self.trusted = self.parent[step]
+                    return DIRS[nbrs.index(step)]
+            if self.stale:
+                self.start_search(self.target)
+
+        self.fallbacks += 1
+        self.trusted = None
+        return self.fallback(game, head, nbrs, deadline)
+
+    # ---------- search tree rooted at the food ----------
+    def start_search(self, food):
+        self.target = food
+        self.trusted = None
+        if food is None:
+            self.g, self.parent, self.open = {}, {}, []
+        else:
+            self.g, self.parent, self.open = {food: 0}, {food: None}, [(0, 0, food)]
+
+    def search(self, game, targets, deadline):
+        # grow the tree until it touches a neighbour of the head; False when
+        # the budget or the reachable area ran out first
+        g, parent, heap, occupied = self.g, self.parent, self.open, game.occupied
+        head = game.snake[0]
+        while True:
+            if any(t in g and not occupied[t] for t in targets):
+                return True
+            if not heap or time.perf_counter() > deadline:
+                return False
+            for _ in range(CHUNK):
+                if not heap:
+                    break
+                _, depth, cell = heapq.heappop(heap)
+                cost = -depth
+                if cost != g[cell]:
+                    continue  # reached more cheaply since
+                for n in self.neighbors(cell):
+                    if occupied[n] or cost + 1 >= g.get(n, 1 << 30):
+                        continue
+                    g[n] = cost + 1
+                    parent[n] = cell
+                    # ties go to the deeper node, which keeps open boards cheap
+                    heapq.heappush(heap, (cost + 1 + self.distance(n, head), -cost - 1, n))
+
+    def route(self, game, nbrs):
+        # the head's neighbours on the tree, closest to the food first,
+        # skipping any whose path the snake has moved across since the tree
+        # was grown. Only the path we're already following skips that walk
+        g, occupied = self.g, game.occupied
+        for n in sorted((n for n in nbrs if n in g and not occupied[n]), key=g.get):
+            if n != self.trusted:
+                cell = self.parent[n]
+                while cell is not None and not occupied[cell]:
+                    cell = self.parent[cell]
+                if cell is not None:
+                    self.stale = True
+                    continue
+            yield n
+
+    # ---------- safety ----------
+    def in_order(self, snake):
+        # every body cell lies on the cycle between the tail and the head
+        tail = snake[-1]
+        span = self.ahead(tail, snake[0])
+        return all(self.ahead(tail, cell) <= span for cell in snake)
+
+    def safe(self, game, head, cell):
+        if self.rank is None or not self.ordered:
+            return not game.occupied[cell]
+        step = self.ahead(head, cell)
+        if step == 1:
+            return True  # the cycle successor: free or the tail, which moves on
+        if game.occupied[cell] or step >= self.ahead(head, game.snake[-1]):
+            return False
+        # skipping past the food would mean a whole lap to come back
+        return game.food is None or step <= self.ahead(head, game.food)
+
+    # ---------- fallback ----------
+    def fallback(self, game, head, nbrs, deadline):
+        if self.rank is not None and self.ordered:
+            # the furthest safe shortcut along the cycle
+            best, best_step = None, 0
+            for n in nbrs:
+                step = self.ahead(head, n)
+                if step > best_step and self.safe(game, head, n):
+                    best, best_step = n, step
+            if best is not None:
+                return DIRS[nbrs.index(best)]
+
+        # no usable cycle: the roomiest free move
+        occupied, tail = game.occupied, game.snake[-1]
+        free = [n for n in nbrs if not occupied[n] or n == tail]
+        if not free:
+            return game.dir
+        limit = len(game.snake) + 1
+        best = max(free, key=lambda n: self.room(game, n, limit, deadline))
+        return DIRS[nbrs.index(best)]
+
+    def room(self, game, start, limit, deadline):
+        # free cells reachable from `start`, counted up to `limit`
+        occupied = game.occupied
+        seen = {start}
+        queue = deque(seen)
+        steps = 0
+        while queue and len(seen) < limit:
+            cell = queue.popleft()
+            for n in self.neighbors(cell):
+                if n not in seen and not occupied[n]:
+                    seen.add(n)
+                    queue.append(n)
+            steps += 1
+            if steps % CHUNK == 0 and time.perf_counter() > deadline:
+                break
+        return len(seen)
+
+    # ---------- reporting ----------
+    def stats(self):
+        recent = sorted(self.times)
+        pick = lambda q: recent[min(len(recent) - 1, int(q * len(recent)))] * 1000.0 if recent else 0.0
+        return {
+            "ticks": self.ticks,
+            "routed": self.routed,
+            "fallbacks": self.fallbacks,
+            "overruns": self.overruns,
+            "avg_ms": self.total_time / self.ticks * 1000.0 if self.ticks else 0.0,
+            "p99_ms": pick(0.99),  # over the recent window
+            "max_ms": self.max_time * 1000.0,
+            "last_ms": self.times[-1] * 1000.0 if self.times else 0.0,
+        }
@@ -0,0 +1,233 @@
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+
+from snaketail_pygame.snake_game import GRID_W, GRID_H, SnakeGame
+
+# Same rules as SnakeGame.logic (wrapping board, tail cell is free to enter,
+# food only on free cells, reversing is ignored like the keyboard handler
+# does) for N boards at once. Bodies are ring buffers: body[i, head[i]] is
+# the head and the tail sits length - 1 slots behind it.
+
+# action / direction index -> (dx, dy); opposite is (d + 2) % 4
+DIRS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+DX = np.array([d[0] for d in DIRS], np.int64)
+DY = np.array([d[1] for d in DIRS], np.int64)
+
+# compact observation columns
+OBS_FIELDS = ("head_x", "head_y", "food_x", "food_y", "dir", "length",
+              "danger_ahead", "danger_left", "danger_right")
+FOOD_TRIES = 8  # rejection-sampling rounds before scanning for a free cell
+
+class BatchSnakeEnv:
+    def __init__(self, n, grid=(GRID_W, GRID_H), seed=None, max_steps=None):
+        self.n = n
+        self.w, self.h = grid
+        self.cells = self.w * self.h
+        self.max_steps = max_steps
+        self.rng = np.random.default_rng(seed)
+        self.rows = np.arange(n)
+        self.body = np.zeros((n, self.cells), np.int64)
+        self.occ = np.zeros((n, self.cells), np.uint8)
+        self.occ_flat = self.occ.reshape(-1)
+        self.head = np.zeros(n, np.int64)
+        self.length = np.zeros(n, np.int64)
+        self.dir = np.zeros(n, np.int64)
+        self.food = np.zeros(n, np.int64)
+        self.score = np.zeros(n, np.int64)
+        self.steps = np.zeros(n, np.int64)
+        self.episodes = 0
+
+    # ---------- gym-style API ----------
+    def reset(self, seed=None):
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self.reset_envs(self.rows)
+        return self.observe()
+
+    def step(self, actions):
+        rows = self.rows
+        actions = np.asarray(actions, np.int64)
+        # reversing straight into the neck is ignored, like in SnakeGame
+        self.dir = np.where(actions == (self.dir + 2) % 4, self.dir, actions)
+
+        head = self.body[rows, self.head]
+        hy, hx = np.divmod(head, self.w)
+        new_head = ((hy + DY[self.dir]) % self.h) * self.w + (hx + DX[self.dir]) % self.w
+        tail = self.body[rows, (self.head - self.length + 1) % self.cells]
+
+        base = rows * self.cells
+        hit = (self.occ_flat[base + new_head] != 0) & (new_head != tail)
+        eat = ~hit & (new_head == self.food)
+        move = ~hit & ~eat
+
+        self.occ_flat[base[move] + tail[move]] = 0
+        alive = ~hit
+        self.head[alive] = (self.head[alive] + 1) % self.cells
+        self.body[rows[alive], self.head[alive]] = new_head[alive]
+        self.occ_flat[base[alive] + new_head[alive]] = 1
+        self.length[eat] += 1
+        self.score[eat] += 1
+        self.steps += 1
+
+        cleared = np.zeros(self.n, bool)
+        eaters = np.flatnonzero(eat)
+        if len(eaters):
+            self.place_food(eaters)
+            cleared[eaters] = self.food[eaters] < 0
+
+        reward = eat.astype(np.float32) - hit.astype(np.float32)
+        done = hit | cleared
+        if self.max_steps is not None:
+            done |= self.steps >= self.max_steps
+
+        info = {"score": self.score.copy(), "cleared": cleared}
+        finished = np.flatnonzero(done)
+        if len(finished):
+            self.episodes += len(finished)
+            self.reset_envs(finished)
+        return self.observe(), reward, done, info
+
+    # ---------- internals ----------
+    def reset_envs(self, idx):
+        w, h = self.w, self.h
+        cx, cy = w // 2, h // 2
+        start = np.array([cy * w + cx - 2, cy * w + cx - 1, cy * w + cx])  # tail .. head
+        self.occ[idx] = 0
+        self.body[idx[:, None], np.arange(3)] = start
+        self.occ[idx[:, None], start] = 1
+        self.head[idx] = 2
+        self.length[idx] = 3
+        self.dir[idx] = 0
+        self.score[idx] = 0
+        self.steps[idx] = 0
+        self.place_food(idx)
+
+    def place_food(self, idx):
+        # uniform over free cells, like FreeCells.choice; -1 when none is left
+        base = idx * self.cells
+        cand = self.rng.integers(0, self.cells, len(idx))
+        for _ in range(FOOD_TRIES):
+            bad = np.flatnonzero(self.occ_flat[base + cand])
+            if len(bad) == 0:
+                break
+            cand[bad] = self.rng.integers(0, self.cells, len(bad))
+        else:
+            # nearly full boards: pick straight from the free cells
+            for j in np.flatnonzero(self.occ_flat[base + cand]):
+                free = np.flatnonzero(self.occ[idx[j]] == 0)
+                cand[j] = self.rng.choice(free) if len(free) else -1
+        self.food[idx] = cand
+
+    def observe(self):
+        rows = self.rows
+        head = self.body[rows, self.head]
+        hy, hx = np.divmod(head, self.w)
+        fy, fx = np.divmod(self.food, self.w)
+        base = rows * self.cells
+        danger = []
+        for turn in (0, 3, 1):  # ahead, left, right
+            d = (self.dir + turn) % 4
+            cell = ((hy + DY[d]) % self.h) * self.w + (hx + DX[d]) % self.w
+            danger.append(self.occ_flat[base + cell])
+        return np.stack([hx, hy, fx, fy, self.dir, self.length, *danger], axis=1)
+
+    def board(self, i):
+        # (h, w) uint8 for one env: 1 body, 2 head, 3 food
+        grid = self.occ[i].copy()
+        grid[self.body[i, self.head[i]]] = 2
+        if self.food[i] >= 0:
+            grid[self.food[i]] = 3
+        return grid.reshape(self.h, self.w)
+
+# ---------------- Parity check ----------------
+# Steps one SnakeGame and a single-board env with the same random actions;
+# board, head, length, score and direction must agree tick for tick. The
+# two sample food differently (an index into FreeCells' swap order vs.
+# rejection sampling over the grid), so the same random state can't give
+# the same cell. Instead every cell the env picks must be one the game's
+# FreeCells holds on the identical board, and only then is the game's food
+# copied over to keep the two runs in step. Raises RuntimeError on the
+# first difference.
+def parity_check(episodes=200, seed=0, grid=(GRID_W, GRID_H)):
+    rnd = random.Random(seed)
+    random.seed(seed)
+    env = BatchSnakeEnv(1, grid=grid, seed=seed)
+    ticks = 0
+
+    def check_food(game):
+        food = int(env.food[0])
+        if (food < 0) != (game.food is None):
+            raise RuntimeError(f"tick {ticks}: env food {food}, game food {game.food}")
+        if food >= 0 and game.free.slot[food] < 0:
+            raise RuntimeError(f"tick {ticks}: env put food on taken cell {food}")
+        env.food[0] = -1 if game.food is None else game.food
+
+    for _ in range(episodes):
+        game = SnakeGame(None, grid=grid)
+        game.state = "PLAY"
+        game.reset()
+        env.reset()
+        check_food(game)
+        while True:
+            a = rnd.randrange(4) if rnd.random() < 0.3 else int(env.dir[0])
+            if DIRS[a] != (-game.dir[0], -game.dir[1]):
+                game.next_dir = DIRS[a]
+            score = int(env.score[0])
+            _, _, done, info = env.step([a])
+            game.logic()
+            ticks += 1
+            if done[0]:
+                if game.state not in ("GAME_OVER", "CLEARED"):
+                    raise RuntimeError(f"tick {ticks}: env ended, game did not")
+                if info["score"][0] != game.score:
+                    raise RuntimeError(f"tick {ticks}: final score {info['score'][0]} vs {game.score}")
+                break
+            if game.state != "PLAY":
+                raise RuntimeError(f"tick {ticks}: game ended, env did not")
+            if env.body[0, env.head[0]] != game.snake[0] or DIRS[env.dir[0]] != game.dir:
+                raise RuntimeError(f"tick {ticks}: head {env.body[0, env.head[0]]} {DIRS[env.dir[0]]} "
+                                   f"vs {game.snake[0]} {game.dir}")
+            if env.length[0] != len(game.snake) or env.score[0] != game.score:
+                raise RuntimeError(f"tick {ticks}: length/score {env.length[0]}/{env.score[0]} "
+                                   f"vs {len(game.snake)}/{game.score}")
+            if not np.array_equal(env.occ[0], np.frombuffer(game.occupied, np.uint8)):
+                raise RuntimeError(f"tick {ticks}: boards differ")
+            if env.score[0] != score:  # ate: both placed new food
+                check_food(game)
+    return ticks
+
+def bench(n, steps, grid, seed=0):
+    env = BatchSnakeEnv(n, grid=grid, seed=seed)
+    env.reset()
+    rng = np.random.default_rng(seed)
+    actions = rng.integers(0, 4, (16, n))
+    t0 = time.perf_counter()
+    for t in range(steps):
+        env.step(actions[t % 16])
+    elapsed = time.perf_counter() - t0
+    return n * steps / elapsed, env.episodes
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless batched snake")
+    parser.add_argument("--check", action="store_true", help="run the parity check against SnakeGame.logic")
+    parser.add_argument("--envs", type=int, default=4096)
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--grid", type=int, nargs=2, default=(GRID_W, GRID_H))
+    args = parser.parse_args()
+
+    if args.check:
+        try:
+            ticks = parity_check(grid=tuple(args.grid))
+        except RuntimeError as e:
+            sys.exit(f"parity check failed: {e}")
+        print(f"parity ok over {ticks} ticks")
+        return
+    rate, episodes = bench(args.envs, args.steps, tuple(args.grid))
+    print(f"{args.envs} envs on {args.grid[0]}x{args.grid[1]}: {rate / 1e6:.2f} M steps/s ({episodes} episodes finished)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+import argparse
+import asyncio
+import random
+import subprocess
+import sys
+import time
+from array import array
+from collections import deque
+from pathlib import Path
+
+from snaketail_pygame.server import (DIE, DIRS, EVENT, FOOD, FRAME, HEAD, HELLO, MSG, MSG_FRAME, MSG_HELLO,
+                                     PER_MATCH, PORT, SNAKE, SNAPSHOT, SPAWN, TAIL)
+
+ROOT = Path(__file__).resolve().parent.parent
+TURN_CHANCE = 0.15
+
+# A headless player: keeps its own copy of the board from the deltas (the
+# same work a real client does) and steers a little randomly, away from
+# anything right in front of it.
+class Bot:
+    def __init__(self, rng):
+        self.rng = rng
+        self.snakes = {}
+        self.occupied = set()
+        self.food = -1
+        self.id = None
+        self.dir = 0
+        self.frames = 0
+        self.bytes = 0
+        self.first_tick = self.last_tick = 0
+        self.latency = []
+
+    def load(self, payload):
+        self.id, self.w, self.h, self.rate = HELLO.unpack_from(payload)
+        tick, self.food, count = SNAPSHOT.unpack_from(payload, HELLO.size)
+        self.first_tick = self.last_tick = tick
+        offset = HELLO.size + SNAPSHOT.size
+        for _ in range(count):
+            sid, length = SNAKE.unpack_from(payload, offset)
+            offset += SNAKE.size
+            body = array("I")
+            body.frombytes(payload[offset:offset + 4 * length])
+            offset += 4 * length
+            self.snakes[sid] = deque(body)
+            self.occupied.update(body)
+
+    def apply(self, payload):
+        tick, stamp = FRAME.unpack_from(payload)
+        self.latency.append(time.monotonic() - stamp)
+        self.frames += 1
+        self.last_tick = tick
+        for kind, sid, cell in EVENT.iter_unpack(payload[FRAME.size:]):
+            if kind == HEAD:
+                self.snakes[sid].appendleft(cell)
+                self.occupied.add(cell)
+            elif kind == TAIL:
+                self.occupied.discard(self.snakes[sid].pop())
+            elif kind == FOOD:
+                self.food = cell
+            elif kind == DIE or kind == SPAWN:
+                body = self.snakes.pop(sid, ())
+                self.occupied.difference_update(body)
+                if kind == SPAWN:
+                    self.snakes[sid] = deque()
+                    if sid == self.id:
+                        self.dir = 0
+
+    def steer(self):
+        body = self.snakes.get(self.id)
+        if not body:
+            return None
+        y, x = divmod(body[0], self.w)
+        ahead = lambda d: ((y + DIRS[d][1]) % self.h) * self.w + (x + DIRS[d][0]) % self.w
+        if ahead(self.dir) not in self.occupied and self.rng.random() > TURN_CHANCE:
+            return None
+        turns = [d for d in ((self.dir + 1) % 4, (self.dir + 3) % 4) if ahead(d) not in self.occupied]
+        if not turns:
+            return None
+        self.dir = self.rng.choice(turns)
+        return self.dir
+
+    async def run(self, host, port, stop_at):
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            while time.monotonic() < stop_at:
+                kind, length = MSG.unpack(await reader.readexactly(MSG.size))
+                payload = await reader.readexactly(length)
+                self.bytes += MSG.size + length
+                if kind == MSG_HELLO:
+                    self.load(payload)
+                elif kind == MSG_FRAME:
+                    self.apply(payload)
+                    d = self.steer()
+                    if d is not None:
+                        writer.write(bytes((d,)))
+        finally:
+            writer.close()
+
+def percentile(values, q):
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+async def measure(host, port, clients, seconds, seed):
+    bots = [Bot(random.Random(seed + i)) for i in range(clients)]
+    stop_at = time.monotonic() + seconds
+    start = time.monotonic()
+    results = await asyncio.gather(*(b.run(host, port, stop_at) for b in bots), return_exceptions=True)
+    elapsed = time.monotonic() - start
+    failed = sum(isinstance(r, Exception) for r in results)
+    latency = sorted(l for b in bots for l in b.latency)
+    ticks = max((b.last_tick - b.first_tick for b in bots), default=0)
+    return {
+        "clients": clients,
+        "failed": failed,
+        "ticks_per_s": ticks / elapsed,
+        "kib_per_client": sum(b.bytes for b in bots) / clients / elapsed / 1024,
+        "p50_ms": percentile(latency, 0.50) * 1000.0,
+        "p99_ms": percentile(latency, 0.99) * 1000.0,
+        "p999_ms": percentile(latency, 0.999) * 1000.0,
+        "max_ms": latency[-1] * 1000.0 if latency else 0.0,
+    }
+
+async def wait_for_server(host, port, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+async def sweep(args):
+    server = None
+    if args.spawn:
+        server = subprocess.Popen([sys.executable, "-m", "snaketail_pygame.server", "--port", str(args.port),
+                                   "--per-match", str(args.per_match), "--report", "0"], cwd=ROOT)
+    try:
+        await wait_for_server(args.host, args.port)
+        print(f"{'clients':>7} {'matches':>7} {'ticks/s':>8} {'KiB/s each':>10} "
+              f"{'p50':>7} {'p99':>7} {'p99.9':>7} {'max ms':>7}")
+        for clients in args.clients:
+            r = await measure(args.host, args.port, clients, args.seconds, args.seed)
+            matches = -(-clients // args.per_match)
+            print(f"{clients:>7} {matches:>7} {r['ticks_per_s']:>8.2f} {r['kib_per_client']:>10.2f} "
+                  f"{r['p50_ms']:>7.2f} {r['p99_ms']:>7.2f} {r['p999_ms']:>7.2f} {r['max_ms']:>7.2f}"
+                  + (f"  ({r['failed']} failed)" if r["failed"] else ""), flush=True)
+            await asyncio.sleep(0.5)  # let the server drop the old matches
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for the snake server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--clients", type=int, nargs="+", default=[100, 200, 400], help="client counts to sweep")
+    parser.add_argument("--seconds", type=float, default=10.0, help="run time per client count")
+    parser.add_argument("--per-match", type=int, default=PER_MATCH,
+                        help="snakes per board (only for the spawned server and the match count)")
+    parser.add_argument("--spawn", action="store_true", help="start a server for the run")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    asyncio.run(sweep(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+import argparse
+import asyncio
+import socket
+import struct
+import time
+from array import array
+from collections import deque
+
+from snaketail_pygame.snake_game import FPS, GRID_W, GRID_H, FreeCells, new_food, step_cell
+
+# Wire format, little endian. Every server message is MSG (kind, payload
+# length) followed by the payload:
+#   HELLO  your snake id, board size and tick rate, then a snapshot: tick,
+#          food, snake count and per snake its id, length and cells (uint32,
+#          head first)
+#   FRAME  tick and the server's time.monotonic() at send, then EVENTs
+# A FRAME only carries what changed that tick. Applying the events in order
+# keeps a client's copy of the board identical to the server's:
+#   HEAD   cell becomes the snake's new head
+#   TAIL   the snake's tail cell is gone
+#   FOOD   food moved to cell (-1: none, the board is full)
+#   DIE    the snake's body is gone
+#   SPAWN  the snake starts over empty; HEAD events lay the body, tail first
+# Clients only send single bytes: an index into DIRS.
+
+DIRS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+MSG = struct.Struct("<BI")
+HELLO = struct.Struct("<HHHH")
+SNAPSHOT = struct.Struct("<IiH")
+SNAKE = struct.Struct("<HI")
+FRAME = struct.Struct("<Id")
+EVENT = struct.Struct("<BHi")
+MSG_HELLO, MSG_FRAME = 1, 2
+HEAD, TAIL, FOOD, DIE, SPAWN = range(5)
+
+PER_MATCH = 8  # snakes sharing one board
+RESPAWN_TICKS = FPS  # ticks on the bench after dying
+MAX_BUFFER = 256 * 1024  # clients this far behind get dropped
+PORT = 7777
+
+class Player:
+    def __init__(self, pid, writer):
+        self.id = pid
+        self.writer = writer
+        self.body = deque()
+        self.dir = (1, 0)
+        self.next_dir = self.dir
+        self.alive = False
+        self.respawn_at = 0
+        self.score = 0
+
+    def steer(self, index):
+        if index < len(DIRS):
+            d = DIRS[index]
+            # same rule as the keyboard: no reversing into yourself
+            if d != (-self.dir[0], -self.dir[1]):
+                self.next_dir = d
+
+class Match:
+    # SnakeGame.logic for several snakes on one board. All snakes move at
+    # once: tails that move on free their cells first (the tail cell is fine
+    # to enter, as in single player), then heads landing on a body or on
+    # each other die.
+    def __init__(self, grid=(GRID_W, GRID_H), rate=FPS):
+        self.w, self.h = grid
+        self.rate = rate
+        self.occupied = bytearray(self.w * self.h)
+        self.free = FreeCells(self.w, self.h)
+        self.food = new_food(self.free)
+        self.players = {}
+        self.tick = 0
+        self.events = []
+
+    def join(self, writer):
+        pid = next(i for i in range(len(self.players) + 1) if i not in self.players)
+        player = Player(pid, writer)
+        self.players[pid] = player
+        self.spawn(player)
+        hello = HELLO.pack(pid, self.w, self.h, self.rate) + self.snapshot()
+        writer.write(MSG.pack(MSG_HELLO, len(hello)) + hello)
+        return player
+
+    def leave(self, player):
+        if player.alive:
+            self.kill(player)
+        del self.players[player.id]
+
+    def snapshot(self):
+        alive = [p for p in self.players.values() if p.alive]
+        food = -1 if self.food is None else self.food
+        parts = [SNAPSHOT.pack(self.tick, food, len(alive))]
+        for p in alive:
+            parts.append(SNAKE.pack(p.id, len(p.body)))
+            parts.append(array("I", p.body).tobytes())
+        return b"".join(parts)
+
+    def spawn(self, player):
+        # three cells in a row with the head on the right, like reset()
+        for _ in range(16):
+            head = self.free.choice()
+            if head is None:
+                break
+            body = [head, step_cell(head, (-1, 0), self.w, self.h)]
+            body.append(step_cell(body[1], (-1, 0), self.w, self.h))
+            # the food cell counts as free, so it is checked along with the body
+            if any(self.occupied[c] or c == self.food for c in body):
+                continue
+            player.body = deque(body)
+            player.dir = player.next_dir = (1, 0)
+            player.alive = True
+            player.score = 0
+            self.events.append((SPAWN, player.id, 0))
+            for cell in reversed(body):
+                self.occupied[cell] = 1
+                self.free.take(cell)
+                self.events.append((HEAD, player.id, cell))
+            return
+        player.respawn_at = self.tick + RESPAWN_TICKS  # no room, try later
+
+    def kill(self, player):
+        for cell in player.body:
+            self.occupied[cell] = 0
+            self.free.give(cell)
+        player.body.clear()
+        player.alive = False
+        player.respawn_at = self.tick + RESPAWN_TICKS
+        self.events.append((DIE, player.id, 0))
+
+    def step(self):
+        self.tick += 1
+        events, occupied = self.events, self.occupied
+        alive = [p for p in self.players.values() if p.alive]
+        moves = {}
+        for p in alive:
+            p.dir = p.next_dir
+            moves[p.id] = step_cell(p.body[0], p.dir, self.w, self.h)
+
+        for p in alive:
+            if moves[p.id] != self.food:
+                tail = p.body.pop()
+                occupied[tail] = 0
+                self.free.give(tail)
+                events.append((TAIL, p.id, tail))
+
+        targets = {}
+        for cell in moves.values():
+            targets[cell] = targets.get(cell, 0) + 1
+        dead = [p for p in alive if occupied[moves[p.id]] or targets[moves[p.id]] > 1]
+        eaten = False
+        for p in alive:
+            if p in dead:
+                continue
+            cell = moves[p.id]
+            p.body.appendleft(cell)
+            occupied[cell] = 1
+            self.free.take(cell)
+            events.append((HEAD, p.id, cell))
+            if cell == self.food:
+                p.score += 1
+                eaten = True
+        for p in dead:
+            self.kill(p)
+
+        if eaten or (self.food is None and len(self.free)):
+            self.food = new_food(self.free)
+            events.append((FOOD, 0, -1 if self.food is None else self.food))
+        for p in self.players.values():
+            if not p.alive and self.tick >= p.respawn_at:
+                self.spawn(p)
+
+    def frame(self, stamp):
+        payload = FRAME.pack(self.tick, stamp) + b"".join(EVENT.pack(*e) for e in self.events)
+        self.events.clear()
+        return MSG.pack(MSG_FRAME, len(payload)) + payload
+
+class SnakeServer:
+    def __init__(self, grid=(GRID_W, GRID_H), per_match=PER_MATCH, rate=FPS):
+        self.grid = grid
+        self.per_match = per_match
+        self.rate = rate
+        self.matches = []
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.ticks = 0
+        self.late = 0
+        self.tick_time = 0.0
+        self.tick_max = 0.0
+        self.bytes_out = 0
+        self.dropped = 0
+
+    def place(self):
+        for match in self.matches:
+            if len(match.players) < self.per_match:
+                return match
+        match = Match(self.grid, self.rate)
+        self.matches.append(match)
+        return match
+
+    async def handle(self, reader, writer):
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        match = self.place()
+        player = match.join(writer)
+        try:
+            while True:
+                data = await reader.read(64)
+                if not data:
+                    break
+                for index in data:
+                    player.steer(index)
+        except ConnectionError:
+            pass
+        finally:
+            match.leave(player)
+            if not match.players:
+                self.matches.remove(match)
+            writer.close()
+
+    def step(self):
+        t0 = time.perf_counter()
+        stamp = time.monotonic()
+        for match in self.matches:
+            match.step()
+            data = match.frame(stamp)
+            for p in list(match.players.values()):
+                transport = p.writer.transport
+                if transport.is_closing():
+                    continue
+                if transport.get_write_buffer_size() > MAX_BUFFER:
+                    self.dropped += 1
+                    transport.abort()
+                    continue
+                transport.write(data)
+                self.bytes_out += len(data)
+        spent = time.perf_counter() - t0
+        self.ticks += 1
+        self.tick_time += spent
+        self.tick_max = max(self.tick_max, spent)
+
+    async def run_ticks(self):
+        # fixed rate on absolute deadlines; a late tick is counted, not made up
+        period = 1.0 / self.rate
+        next_at = time.monotonic()
+        while True:
+            next_at += period
+            self.step()
+            delay = next_at - time.monotonic()
+            if delay < 0:
+                self.late += 1
+                next_at = time.monotonic()
+            await asyncio.sleep(max(0.0, delay))
+
+    async def report(self, every):
+        while True:
+            await asyncio.sleep(every)
+            players = sum(len(m.players) for m in self.matches)
+            avg = self.tick_time / self.ticks * 1000.0 if self.ticks else 0.0
+            print(f"{len(self.matches)} matches, {players} players: {self.ticks / every:.1f} ticks/s"
+                  f"  tick avg {avg:.2f} max {self.tick_max * 1000.0:.2f} ms  late {self.late}"
+                  f"  out {self.bytes_out / every / 1024:.1f} KiB/s  dropped {self.dropped}", flush=True)
+            self.reset_stats()
+
+async def serve(host, port, grid, per_match, rate, report):
+    server = SnakeServer(grid, per_match, rate)
+    listener = await asyncio.start_server(server.handle, host, port)
+    print(f"snake server on {host}:{port}, {grid[0]}x{grid[1]} boards, {per_match} per match, {rate} ticks/s", flush=True)
+    tasks = [server.run_ticks()]
+    if report:
+        tasks.append(server.report(report))
+    async with listener:
+        await asyncio.gather(listener.serve_forever(), *tasks)
+
+def main():
+    parser = argparse.ArgumentParser(description="Multiplayer snake server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--grid", type=int, nargs=2, default=(GRID_W, GRID_H))
+    parser.add_argument("--per-match", type=int, default=PER_MATCH, help="snakes per board")
+    parser.add_argument("--rate", type=int, default=FPS, help="ticks per second")
+    parser.add_argument("--report", type=float, default=5.0, metavar="SECONDS", help="stats interval, 0 for none")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, tuple(args.grid), args.per_match, args.rate, args.report))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
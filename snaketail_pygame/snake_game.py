@@ -1,15 +1,47 @@
+import argparse
 import pygame
 import random
 import sys
+from array import array
+from collections import deque
+from itertools import islice
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np
+
+from game_common.input import InputBuffer, filter_events
+from game_common.loop import FixedLoop
+from game_common.profiler import FrameProfiler
+from game_common.scores import EMPTY, ScoreStore, describe
+from game_common.screens import StaticScreen
+from game_common.text import TextCache, HudField
+from snaketail_pygame.autopilot import Autopilot
+
 # ------------- Config -------------
 WIDTH, HEIGHT = 640, 480
 CELL = 20
 GRID_W, GRID_H = WIDTH // CELL, HEIGHT // CELL
 FPS = 12  # base speed; increases slightly as you grow
+RENDER_FPS = 60
+SHADE_SEGMENTS = 24  # body segments past this all share the darkest shade
+VIEW_CELL = 8  # on-screen cell size for boards bigger than the window
+LARGE_BOARD = (2000, 2000)
+AUTOPILOT_BUDGET_MS = 2.0  # planning time allowed per logic tick
+REWIND_TICKS = 4096  # ticks kept for rewinding
 FONT_NAME = "freesansbold.ttf"
-HIGHSCORE_FILE = Path("highscore.txt")
+HIGHSCORE_FILE = Path("highscore.txt")  # the old one-number store, migrated once
+
+# direction each turn key heads in
+TURN_KEYS = {
+    pygame.K_UP: (0, -1), pygame.K_w: (0, -1),
+    pygame.K_DOWN: (0, 1), pygame.K_s: (0, 1),
+    pygame.K_LEFT: (-1, 0), pygame.K_a: (-1, 0),
+    pygame.K_RIGHT: (1, 0), pygame.K_d: (1, 0),
+}
 
 # Colors
 BLACK = (12, 12, 12)
@@ -21,63 +53,246 @@ YELLOW = (245, 205, 60)
 BLUE = (85, 160, 255)
 
 # ------------- Helpers -------------
-def load_highscore():
-    try:
-        if HIGHSCORE_FILE.exists():
-            return int(HIGHSCORE_FILE.read_text().strip())
-    except Exception:
-        pass
-    return 0
-
-def save_highscore(score):
-    try:
-        HIGHSCORE_FILE.write_text(str(score))
-    except Exception:
-        pass
-
-def draw_text(surface, text, size, color, center):
-    font = pygame.font.Font(FONT_NAME, size)
-    surf = font.render(text, True, color)
-    rect = surf.get_rect(center=center)
-    surface.blit(surf, rect)
-
-def new_food(snake):
-    while True:
-        pos = (random.randrange(GRID_W), random.randrange(GRID_H))
-        if pos not in snake:
-            return pos
+def score_game(grid):
+    # scores only compare on the same board, so each size is its own game
+    return "snake" if tuple(grid) == (GRID_W, GRID_H) else f"snake-{grid[0]}x{grid[1]}"
 
-def wrap(pos):
-    x, y = pos
-    return (x % GRID_W, y % GRID_H)
+TEXT = TextCache(FONT_NAME)
 
-def add_tuple(a, b):
-    return (a[0] + b[0], a[1] + b[1])
+def draw_text(surface, text, size, color, center):
+    return TEXT.draw(surface, text, size, color, center)
+
+# Cells are plain ints (y * grid_w + x) so the body, the occupancy grid and
+# the free-cell index never allocate tuples per tick.
+DIRS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+
+def step_cell(cell, d, w=GRID_W, h=GRID_H):
+    y, x = divmod(cell, w)
+    return ((y + d[1]) % h) * w + (x + d[0]) % w
+
+# Unoccupied cells as a swap-remove array: `cells` holds every free cell id
+# and `slot[cell]` is its index there, -1 while occupied.
+# take/give/choice are all O(1) no matter how full the board is.
+class FreeCells:
+    def __init__(self, w=GRID_W, h=GRID_H):
+        # typed arrays keep multi-million cell boards at 4 bytes per cell
+        self.cells = array("i")
+        self.cells.frombytes(np.arange(w * h, dtype=np.int32).tobytes())
+        self.slot = array("i", self.cells)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def take(self, cell):
+        # returns the slot `cell` had, which is all untake needs
+        i = self.slot[cell]
+        last = self.cells.pop()
+        if last != cell:
+            self.cells[i] = last
+            self.slot[last] = i
+        self.slot[cell] = -1
+        return i
+
+    def give(self, cell):
+        self.slot[cell] = len(self.cells)
+        self.cells.append(cell)
+
+    # exact inverses, applied in reverse order they restore the array order
+    # too, so the same random state picks the same cell again
+    def untake(self, cell, i):
+        if i < len(self.cells):
+            moved = self.cells[i]
+            self.slot[moved] = len(self.cells)
+            self.cells.append(moved)
+            self.cells[i] = cell
+        else:
+            self.cells.append(cell)
+        self.slot[cell] = i
+
+    def ungive(self):
+        cell = self.cells.pop()
+        self.slot[cell] = -1
+        return cell
+
+    def choice(self):
+        if not self.cells:
+            return None
+        return self.cells[random.randrange(len(self.cells))]
+
+def new_food(free):
+    # None means there is nowhere left to put food: the board is cleared
+    return free.choice()
+
+# Rewind log: one packed word per tick, (free slot of the new head << 3) |
+# (ate << 2) | direction before the move. That is enough to undo the tick:
+# the head is snake[0], the tail that left is the last cell given back to
+# FreeCells and eaten food sat where the head is now. Fixed size, so memory
+# and per-tick cost don't depend on the snake's length.
+class TickHistory:
+    def __init__(self, capacity=REWIND_TICKS):
+        self.words = array("Q", bytes(8 * capacity))
+        self.capacity = capacity
+        self.end = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, word):
+        # returns the word that fell off the far end, if any
+        evicted = self.words[self.end] if self.size == self.capacity else None
+        self.words[self.end] = word
+        self.end = (self.end + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        return evicted
+
+    def pop(self):
+        if not self.size:
+            return None
+        self.end = (self.end - 1) % self.capacity
+        self.size -= 1
+        return self.words[self.end]
+
+    def clear(self):
+        self.end = self.size = 0
+
+# ------------- Large boards -------------
+# Boards bigger than the window are drawn through a camera centred on the
+# head. The visible window is cut out of the occupancy grid as a uint8 array,
+# coloured through a palette and scaled up with one transform + one blit, so
+# frame cost depends on the viewport size only.
+class Viewport:
+    PALETTE = [BLACK, (120, 220, 160), YELLOW, RED]  # empty, body, head, food
+
+    def __init__(self, game, size=(WIDTH, HEIGHT), cell=VIEW_CELL):
+        self.game = game
+        self.size = size
+        self.cols, self.rows = size[0] // cell, size[1] // cell
+        self.cells = pygame.Surface((self.cols, self.rows), depth=8)
+        self.cells.set_palette(self.PALETTE)
+        self.scaled = pygame.Surface(size, depth=8)
+        self.scaled.set_palette(self.PALETTE)
+
+    def origin(self):
+        g = self.game
+        hx, hy = g.cell_xy(g.snake[0])
+        return (hx - self.cols // 2) % g.grid_w, (hy - self.rows // 2) % g.grid_h
+
+    def cut(self):
+        g = self.game
+        grid = np.frombuffer(g.occupied, np.uint8).reshape(g.grid_h, g.grid_w)
+        x0, y0 = self.origin()
+        ys = (y0 + np.arange(self.rows)) % g.grid_h
+        xs = (x0 + np.arange(self.cols)) % g.grid_w
+        view = grid[ys[:, None], xs]
+        view[self.rows // 2, self.cols // 2] = 2
+        if g.food is not None:
+            fx, fy = g.cell_xy(g.food)
+            dx, dy = (fx - x0) % g.grid_w, (fy - y0) % g.grid_h
+            if dx < self.cols and dy < self.rows:
+                view[dy, dx] = 3
+        return view
+
+    def draw(self, surf):
+        pygame.surfarray.blit_array(self.cells, self.cut().T)
+        pygame.transform.scale(self.cells, self.size, self.scaled)
+        surf.blit(self.scaled, (0, 0))
 
 # ------------- Game -------------
 class SnakeGame:
-    def __init__(self, screen):
+    def __init__(self, screen, grid=(GRID_W, GRID_H), autopilot=False, budget_ms=AUTOPILOT_BUDGET_MS, turbo=1.0,
+                 scores=None):
         self.screen = screen
-        self.clock = pygame.time.Clock()
+        self.scores = scores  # ScoreStore for finished runs; None keeps nothing
+        self.score_game = score_game(grid)
+        self.grid_w, self.grid_h = grid
+        self.budget_ms = budget_ms
+        self.autopilot = None
+        if autopilot:
+            self.toggle_autopilot()
+        self.loop = FixedLoop(1.0 / FPS, RENDER_FPS, turbo)
+        self.loop.bind(self.handle_input, self.tick, self.render, self.idle)
+        self.input = InputBuffer(TURN_KEYS)
+        self.profiler = FrameProfiler(self.loop, [
+            (self, "draw_play", "draw"), (self, "draw_board", "board"), (self, "draw_board_changes", "board"),
+            (self, "draw_hud", "hud"), (self, "draw_hud_changes", "hud"), (Autopilot, "choose", "autopilot"),
+        ], on_toggle=self.profiler_toggled, inputs=self.input)
         self.state = "MENU"
+        self.hud_score = HudField(TEXT, "Score: {}", 20, WHITE, (60, 16))
+        self.hud_best = HudField(TEXT, "Best: {}", 20, BLUE, (WIDTH - 70, 16))
+        self.hud_auto = HudField(TEXT, "Autopilot {:.2f} ms", 16, (180, 180, 180), (WIDTH // 2, HEIGHT - 12))
+        self.hud_rewind = HudField(TEXT, "<< {}", 16, YELLOW, (40, HEIGHT - 12))
+        self.history = TickHistory()
+        self.food_states = deque()  # random state before each food roll still in the history
+        self.rewinding = False
+        self.menu_screen = StaticScreen(screen, self.render_menu)
+        self.game_over_screen = StaticScreen(screen, self.render_game_over)
+        self.background = None
+        self.board = None
+        self.last_view = None
+        self.update_rects = None
+        self.viewport = None
+        if self.grid_w > GRID_W or self.grid_h > GRID_H:
+            self.viewport = Viewport(self)
         self.reset()
 
-        self.highscore = load_highscore()
+        self.highscore = 0
+        if scores is not None:
+            scores.track(self.score_game, HIGHSCORE_FILE if self.score_game == "snake" else None)
 
     def reset(self):
-        cx, cy = GRID_W // 2, GRID_H // 2
-        self.snake = [(cx, cy), (cx - 1, cy), (cx - 2, cy)]
+        w = self.grid_w
+        cx, cy = w // 2, self.grid_h // 2
+        self.set_body([cy * w + cx, cy * w + cx - 1, cy * w + cx - 2])
         self.dir = (1, 0)
         self.next_dir = self.dir
-        self.food = new_food(self.snake)
+        self.food = new_food(self.free)
+        self.dirty_cells = set()
+        self.board_stale = True
+        self.stale_moves = 0  # moves and rewinds since the board was last painted
+        self.full_redraw = True
         self.score = 0
+        self.elapsed = 0.0
+        self.run_key = self.scores.new_run() if self.scores is not None else None
         self.paused = False
-        self.just_moved = False  # prevents instant reverse in one tick
+        self.input.clear()
+        self.history.clear()
+        self.food_states.clear()
+        self.set_rewinding(False)
+
+    def set_body(self, cells):
+        # head first; rebuilds the occupancy grid and the free-cell index
+        self.snake = deque(cells)
+        self.occupied = bytearray(self.grid_w * self.grid_h)
+        self.free = FreeCells(self.grid_w, self.grid_h)
+        for cell in self.snake:
+            self.occupied[cell] = 1
+            self.free.take(cell)
+
+    def toggle_autopilot(self):
+        if self.autopilot is None:
+            self.autopilot = Autopilot(self.grid_w, self.grid_h, self.budget_ms)
+        else:
+            self.autopilot = None
+        self.full_redraw = True
+
+    def set_rewinding(self, on):
+        if on != self.rewinding:
+            self.rewinding = on
+            self.full_redraw = True
+
+    def cell_xy(self, cell):
+        return (cell % self.grid_w, cell // self.grid_w)
 
     def handle_input(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                pygame.event.post(event)  # for a launcher running the game
                 self.quit_game()
+                return
+            self.input.feed(event)
+            if self.profiler.handle(event):
+                continue
             if event.type == pygame.KEYDOWN:
                 if self.state == "MENU":
                     if event.key in (pygame.K_RETURN, pygame.K_SPACE):
@@ -88,155 +303,361 @@ class SnakeGame:
                 elif self.state == "PLAY":
                     if event.key in (pygame.K_p, pygame.K_PAUSE):
                         self.paused = not self.paused
-                    if not self.paused and not self.just_moved:
-                        if event.key in (pygame.K_UP, pygame.K_w):
-                            if self.dir != (0, 1): self.next_dir = (0, -1)
-                        elif event.key in (pygame.K_DOWN, pygame.K_s):
-                            if self.dir != (0, -1): self.next_dir = (0, 1)
-                        elif event.key in (pygame.K_LEFT, pygame.K_a):
-                            if self.dir != (1, 0): self.next_dir = (-1, 0)
-                        elif event.key in (pygame.K_RIGHT, pygame.K_d):
-                            if self.dir != (-1, 0): self.next_dir = (1, 0)
-                elif self.state == "GAME_OVER":
+                        self.input.clear()
+                    elif event.key == pygame.K_TAB:
+                        self.toggle_autopilot()
+                    elif event.key == pygame.K_BACKSPACE:
+                        self.set_rewinding(True)
+                elif self.state in ("GAME_OVER", "CLEARED"):
                     if event.key in (pygame.K_r, pygame.K_RETURN, pygame.K_SPACE):
                         self.state = "PLAY"
                         self.reset()
+                    elif event.key == pygame.K_BACKSPACE and self.history:
+                        # back into the run, a tick before it ended
+                        self.state = "PLAY"
+                        self.set_rewinding(True)
                     elif event.key == pygame.K_m:
                         self.state = "MENU"
                     elif event.key == pygame.K_q:
                         self.quit_game()
+            if event.type == pygame.KEYUP and event.key == pygame.K_BACKSPACE:
+                self.set_rewinding(False)
+
+    def next_turn(self):
+        # one queued turn per tick, so a quick UP, LEFT makes both turns in
+        # order instead of the second overwriting the first; presses that
+        # would go straight on or back into the neck are skipped
+        if self.state != "PLAY" or self.paused:
+            return
+        if self.rewinding:
+            self.input.clear()  # nothing to steer going backwards
+            return
+        while True:
+            key = self.input.take(TURN_KEYS)
+            if key is None:
+                return
+            d = TURN_KEYS[key]
+            if d != self.dir and d != (-self.dir[0], -self.dir[1]):
+                self.next_dir = d
+                return
 
     def logic(self):
         if self.state != "PLAY" or self.paused:
             return
+        if self.rewinding:
+            self.rewind()
+            return
+
+        if self.autopilot is not None:
+            self.next_dir = self.autopilot.choose(self)
 
         # move snake
+        record = DIRS.index(self.dir)
         self.dir = self.next_dir
-        new_head = wrap(add_tuple(self.snake[0], self.dir))
-
-        # collision with self -> game over
-        if new_head in self.snake:
-            self.state = "GAME_OVER"
-            if self.score > self.highscore:
-                self.highscore = self.score
-                save_highscore(self.highscore)
+        snake = self.snake
+        new_head = step_cell(snake[0], self.dir, self.grid_w, self.grid_h)
+        tail = snake[-1]
+
+        # collision with self -> game over. The tail cell is fine to enter:
+        # it moves away this tick (food is never on the body, so eating
+        # never lands on the tail)
+        if self.occupied[new_head] and new_head != tail:
+            self.end("GAME_OVER")
             return
 
-        self.snake.insert(0, new_head)
-        self.just_moved = True
+        eating = new_head == self.food
+        if not eating:
+            snake.pop()
+            self.occupied[tail] = 0
+            self.free.give(tail)
+            self.dirty_cells.add(tail)
+        snake.appendleft(new_head)
+        self.occupied[new_head] = 1
+        record |= self.free.take(new_head) << 3 | eating << 2
+        evicted = self.history.push(record)
+        if evicted is not None and evicted & 4:
+            self.food_states.popleft()
 
         # eat food
-        if new_head == self.food:
+        if eating:
             self.score += 1
-            self.food = new_food(self.snake)
+            self.food_states.append(random.getstate())
+            self.food = new_food(self.free)
+            if self.food is None:
+                self.end("CLEARED")
+            else:
+                self.dirty_cells.add(self.food)
+        self.board_stale = True
+        self.stale_moves += 1
+
+    def rewind(self):
+        # undo the last logged tick; stays put once the log runs out
+        record = self.history.pop()
+        if record is None:
+            return
+        snake = self.snake
+        head = snake.popleft()
+        self.occupied[head] = 0
+        self.free.untake(head, record >> 3)
+        self.dirty_cells.add(head)
+        if record & 4:
+            self.score -= 1
+            if self.food is not None:
+                self.dirty_cells.add(self.food)
+            self.food = head
+            random.setstate(self.food_states.pop())
         else:
-            self.snake.pop()
-
-    def draw_grid(self):
-        for x in range(0, WIDTH, CELL):
-            pygame.draw.line(self.screen, GRAY, (x, 0), (x, HEIGHT), 1)
-        for y in range(0, HEIGHT, CELL):
-            pygame.draw.line(self.screen, GRAY, (0, y), (WIDTH, y), 1)
-
-    def draw_snake(self):
+            tail = self.free.ungive()
+            snake.append(tail)
+            self.occupied[tail] = 1
+            self.dirty_cells.add(tail)
+        self.dir = self.next_dir = DIRS[record & 3]
+        self.board_stale = True
+        self.stale_moves += 1
+
+    def end(self, state):
+        # a run rewound into and ended again replaces its row: one run, as it ended last
+        self.state = state
+        self.highscore = max(self.highscore, self.score)
+        if self.scores is not None:
+            self.scores.add(self.score_game, self.score, self.elapsed, run=self.run_key)
+
+    def leaderboard(self):
+        # latest leaderboard; its best can be ahead of this session's
+        board = self.scores.board(self.score_game) if self.scores is not None else EMPTY
+        self.highscore = max(self.highscore, board.best)
+        return board
+
+    def render_background(self):
+        # the grid never changes: baked once, cells are restored from it
+        bw, bh = self.grid_w * CELL, self.grid_h * CELL
+        bg = pygame.Surface((bw, bh))
+        bg.fill(BLACK)
+        for x in range(0, bw, CELL):
+            pygame.draw.line(bg, GRAY, (x, 0), (x, bh), 1)
+        for y in range(0, bh, CELL):
+            pygame.draw.line(bg, GRAY, (0, y), (bw, y), 1)
+        if pygame.display.get_surface() is not None:
+            bg = bg.convert()
+        return bg
+
+    def cell_rect(self, cell):
+        y, x = divmod(cell, self.grid_w)
+        return pygame.Rect(x * CELL, y * CELL, CELL, CELL)
+
+    def paint_segment(self, surf, rect, i):
         # gradient-ish body
-        for i, (x, y) in enumerate(self.snake):
-            rect = pygame.Rect(x * CELL, y * CELL, CELL, CELL)
-            if i == 0:
-                pygame.draw.rect(self.screen, YELLOW, rect)
-                # eyes
-                cx, cy = rect.center
-                eye = 3
-                dx, dy = self.dir
-                ex1 = cx + (CELL//4) * (dx if dx != 0 else -1)
-                ey1 = cy + (CELL//4) * (dy if dy != 0 else -1)
-                ex2 = cx + (CELL//4) * (dx if dx != 0 else 1)
-                ey2 = cy + (CELL//4) * (dy if dy != 0 else 1)
-                pygame.draw.circle(self.screen, BLACK, (ex1, ey1), eye)
-                pygame.draw.circle(self.screen, BLACK, (ex2, ey2), eye)
-            else:
-                shade = max(60, 200 - i * 6)
-                pygame.draw.rect(self.screen, (shade, 220, 160), rect)
+        if i == 0:
+            pygame.draw.rect(surf, YELLOW, rect)
+            # eyes
+            cx, cy = rect.center
+            eye = 3
+            dx, dy = self.dir
+            ex1 = cx + (CELL//4) * (dx if dx != 0 else -1)
+            ey1 = cy + (CELL//4) * (dy if dy != 0 else -1)
+            ex2 = cx + (CELL//4) * (dx if dx != 0 else 1)
+            ey2 = cy + (CELL//4) * (dy if dy != 0 else 1)
+            pygame.draw.circle(surf, BLACK, (ex1, ey1), eye)
+            pygame.draw.circle(surf, BLACK, (ex2, ey2), eye)
+        else:
+            shade = max(60, 200 - i * 6)
+            pygame.draw.rect(surf, (shade, 220, 160), rect)
 
-    def draw_food(self):
-        x, y = self.food
-        rect = pygame.Rect(x * CELL, y * CELL, CELL, CELL)
-        pygame.draw.rect(self.screen, RED, rect)
+    def paint_food(self, surf, rect):
+        pygame.draw.rect(surf, RED, rect)
         # small highlight
-        pygame.draw.rect(self.screen, WHITE, rect.inflate(-CELL//2, -CELL//2), 1)
+        pygame.draw.rect(surf, WHITE, rect.inflate(-CELL//2, -CELL//2), 1)
+
+    def paint_cell(self, surf, cell, i):
+        rect = self.cell_rect(cell)
+        surf.blit(self.background, rect, rect)
+        if cell == self.food:
+            self.paint_food(surf, rect)
+        elif self.occupied[cell]:
+            self.paint_segment(surf, rect, i)
+        return rect
+
+    def draw_board(self):
+        # full repaint of the persistent board surface
+        if self.background is None:
+            self.background = self.render_background()
+            self.board = self.background.copy()
+        self.board.blit(self.background, (0, 0))
+        for i, cell in enumerate(self.snake):
+            self.paint_segment(self.board, self.cell_rect(cell), i)
+        if self.food is not None:
+            self.paint_food(self.board, self.cell_rect(self.food))
+        self.dirty_cells.clear()
+        self.board_stale = False
+        self.stale_moves = 0
+
+    def draw_board_changes(self):
+        # per frame: cells the logic touched (vacated tail, new food) plus the
+        # head end of the body, whose shades shift by one segment every move;
+        # a frame that caught up on several ticks repaints one more per tick.
+        # Constant work however long the snake is.
+        rects = [self.paint_cell(self.board, cell, SHADE_SEGMENTS) for cell in self.dirty_cells]
+        self.dirty_cells.clear()
+        for i, cell in enumerate(islice(self.snake, SHADE_SEGMENTS + max(1, self.stale_moves))):
+            rects.append(self.paint_cell(self.board, cell, i))
+        self.board_stale = False
+        self.stale_moves = 0
+        return rects
+
+    def draw_play(self):
+        if self.viewport is not None:
+            # cut fresh from the grid every frame; the board bookkeeping is unused
+            self.dirty_cells.clear()
+            self.stale_moves = 0
+            self.viewport.draw(self.screen)
+            self.draw_hud()
+            self.update_rects = None
+            return
+
+        view = (self.state, self.paused)
+        if self.full_redraw or view != self.last_view:
+            self.draw_board()
+            self.screen.blit(self.board, (0, 0))
+            self.draw_hud()
+            self.full_redraw = False
+            self.update_rects = None
+            return
+
+        rects = self.draw_board_changes() if self.board_stale else []
+        for r in rects:
+            self.screen.blit(self.board, r, r)
+        self.update_rects = rects + self.draw_hud_changes(rects)
+
+    def draw_hud_changes(self, rects):
+        # HUD text sits on top of the board: redraw it when its value changed
+        # or a repainted cell went underneath it
+        changed = []
+        for hud, value in self.hud_values():
+            old = hud.rect
+            if hud.update(value):
+                if old is not None:
+                    self.screen.blit(self.board, old, old)
+                    changed.append(old)
+            elif hud.rect.collidelist(rects) == -1:
+                continue
+            self.screen.blit(self.board, hud.rect, hud.rect)
+            self.screen.blit(hud.surf, hud.rect)
+            changed.append(hud.rect)
+        return changed
+
+    def hud_values(self):
+        values = [(self.hud_score, self.score), (self.hud_best, self.highscore)]
+        if self.autopilot is not None and self.autopilot.times:
+            values.append((self.hud_auto, self.autopilot.times[-1] * 1000.0))
+        if self.rewinding:
+            values.append((self.hud_rewind, len(self.history)))
+        return values
 
     def draw_hud(self):
-        draw_text(self.screen, f"Score: {self.score}", 20, WHITE, (60, 16))
-        draw_text(self.screen, f"Best: {self.highscore}", 20, BLUE, (WIDTH - 70, 16))
+        for hud, value in self.hud_values():
+            hud.draw(self.screen, value)
 
         if self.paused:
             draw_text(self.screen, "PAUSED", 28, YELLOW, (WIDTH // 2, 20))
 
     def draw_menu(self):
+        self.leaderboard()
+        self.menu_screen.draw()
+
+    def render_menu(self):
         self.screen.fill(BLACK)
         title_y = HEIGHT // 3
         draw_text(self.screen, "S N A K E", 56, GREEN, (WIDTH // 2, title_y))
         draw_text(self.screen, "Eat food, avoid your tail. Wraps at edges.", 20, WHITE, (WIDTH // 2, title_y + 50))
         draw_text(self.screen, "Press ENTER/SPACE to Start", 22, YELLOW, (WIDTH // 2, title_y + 110))
-        draw_text(self.screen, "Controls: Arrow Keys / WASD • P to Pause", 18, WHITE, (WIDTH // 2, title_y + 150))
-        draw_text(self.screen, "Q to Quit", 16, (180, 180, 180), (WIDTH // 2, title_y + 185))
+        draw_text(self.screen, "Controls: Arrow Keys / WASD • P to Pause • TAB Autopilot", 18, WHITE, (WIDTH // 2, title_y + 150))
+        draw_text(self.screen, "Hold BACKSPACE to Rewind • Q to Quit", 16, (180, 180, 180), (WIDTH // 2, title_y + 185))
 
     def draw_game_over(self):
+        self.game_over_screen.draw((self.state, self.score, self.leaderboard(), bool(self.history)))
+
+    def render_game_over(self):
         self.screen.fill(BLACK)
-        draw_text(self.screen, "You Died!", 52, RED, (WIDTH // 2, HEIGHT // 3))
+        if self.state == "CLEARED":
+            draw_text(self.screen, "Board Cleared!", 52, GREEN, (WIDTH // 2, HEIGHT // 3))
+        else:
+            draw_text(self.screen, "You Died!", 52, RED, (WIDTH // 2, HEIGHT // 3))
         draw_text(self.screen, f"Score: {self.score}", 26, WHITE, (WIDTH // 2, HEIGHT // 3 + 60))
         draw_text(self.screen, f"Best: {self.highscore}", 22, BLUE, (WIDTH // 2, HEIGHT // 3 + 95))
         draw_text(self.screen, "R / ENTER / SPACE: Retry", 20, YELLOW, (WIDTH // 2, HEIGHT // 3 + 150))
         draw_text(self.screen, "M: Main Menu   •   Q: Quit", 18, (190, 190, 190), (WIDTH // 2, HEIGHT // 3 + 185))
+        if self.history:
+            draw_text(self.screen, "Hold BACKSPACE to Rewind", 16, (150, 150, 150), (WIDTH // 2, HEIGHT // 3 + 215))
+        for i, line in enumerate(describe(self.leaderboard())):
+            draw_text(self.screen, line, 16, WHITE, (WIDTH // 2, HEIGHT // 3 + 250 + 22 * i))
 
     def draw(self):
+        # update_rects: None for a full flip, otherwise the rects that changed
+        self.update_rects = None
         if self.state == "MENU":
             self.draw_menu()
-            return
-
-        if self.state == "PLAY":
-            self.screen.fill(BLACK)
-            self.draw_grid()
-            self.draw_snake()
-            self.draw_food()
-            self.draw_hud()
-            return
-
-        if self.state == "GAME_OVER":
+        elif self.state == "PLAY":
+            self.draw_play()
+        elif self.state in ("GAME_OVER", "CLEARED"):
             self.draw_game_over()
-            return
+        self.last_view = (self.state, self.paused)
+
+    def present(self):
+        if self.update_rects is None:
+            pygame.display.flip()
+        elif self.update_rects:
+            pygame.display.update(self.update_rects)
 
     def quit_game(self):
-        pygame.quit()
-        sys.exit()
+        # back to whoever started the game: the script ends, a launcher carries on
+        self.loop.stop()
+
+    def idle(self):
+        return self.state != "PLAY" or self.paused
+
+    def tick(self, dt):
+        self.elapsed += dt
+        self.next_turn()
+        self.logic()
+        # Increase speed slightly as snake grows
+        self.loop.step = 1.0 / (FPS + min(10, self.score // 3))
+
+    def render(self, alpha):
+        # the board moves a whole cell per logical tick for crisp movement,
+        # so there is nothing to draw in between
+        self.draw()
+        self.present()
+        self.input.presented()
+
+    def profiler_toggled(self, on):
+        # the overlay was drawn over board cells that only get repainted when they change
+        self.full_redraw = True
 
     def run(self):
-        tick_accumulator = 0.0
-        base_dt = 1.0 / FPS
-
-        while True:
-            self.handle_input()
-
-            # Increase speed slightly as snake grows
-            dynamic_fps = FPS + min(10, self.score // 3)
-            dt = 1.0 / dynamic_fps
-
-            tick_accumulator += self.clock.tick(60) / 1000.0
-
-            # Update only on logical ticks for crisp movement
-            while tick_accumulator >= dt:
-                self.logic()
-                self.just_moved = False
-                tick_accumulator -= dt
-
-            self.draw()
-            pygame.display.flip()
+        self.loop.run()
 
 def main():
-    pygame.init()
+    parser = argparse.ArgumentParser(description="Snake")
+    parser.add_argument("--board", type=int, nargs=2, metavar=("W", "H"), default=(GRID_W, GRID_H),
+                        help="board size in cells; bigger than the window scrolls with the head")
+    parser.add_argument("--large", action="store_const", dest="board", const=LARGE_BOARD,
+                        help=f"shortcut for --board {LARGE_BOARD[0]} {LARGE_BOARD[1]}")
+    parser.add_argument("--autopilot", action="store_true", help="start with the autopilot driving (TAB toggles)")
+    parser.add_argument("--budget", type=float, default=AUTOPILOT_BUDGET_MS, metavar="MS",
+                        help="autopilot planning budget per logic tick")
+    parser.add_argument("--turbo", type=float, default=1.0, help="logic ticks run this many times faster")
+    parser.add_argument("--profile", action="store_true", help="start with the frame profiler on (F3 toggles, F4 dumps)")
+    args = parser.parse_args()
+
+    pygame.display.init()  # just what the game uses: no audio, joystick, ...
+    pygame.font.init()
+    filter_events()
     pygame.display.set_caption("Snake — Start Menu & Died Screen")
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
-    game = SnakeGame(screen)
+    game = SnakeGame(screen, grid=tuple(args.board), autopilot=args.autopilot, budget_ms=args.budget,
+                     turbo=args.turbo, scores=ScoreStore())
+    if args.profile:
+        game.profiler.toggle()
     game.run()
 
 if __name__ == "__main__":